@@ -12,23 +12,28 @@ extension_template = Template(pkgutil.get_data(__name__, "templates/extension.te
 query_template = Template(pkgutil.get_data(__name__, "templates/query.template").decode('utf-8'))
 common_template = Template(pkgutil.get_data(__name__, "templates/common.template").decode('utf-8'))
 common_docs_template = Template(pkgutil.get_data(__name__, "templates/common.docs.template").decode('utf-8'))
-enum_custom_method_template = Template(pkgutil.get_data(__name__, "templates/enum.custom.method.template").decode('utf-8'))
 number_query_attr_template = Template(pkgutil.get_data(__name__, "templates/number.query.attr.template").decode('utf-8'))
 enum_query_attr_template = Template(pkgutil.get_data(__name__, "templates/enum.query.attr.template").decode('utf-8'))
+number_field_metadata_template = Template(pkgutil.get_data(__name__, "templates/number.field.metadata.template").decode('utf-8'))
+enum_field_metadata_template = Template(pkgutil.get_data(__name__, "templates/enum.field.metadata.template").decode('utf-8'))
+common_registry_template = Template(pkgutil.get_data(__name__, "templates/common.registry.template").decode('utf-8'))
+common_accessors_template = Template(pkgutil.get_data(__name__, "templates/common.accessors.template").decode('utf-8'))
 
 ENUM_MEMBERS = "    {member} = \"{value}\"\n"
-SORTABLE_IS_NULL_ATTR = "        self.{partial_name} = _NullCheck(\"{field_name}\", query_block)\n"
-DATETIME_QUERY_EXT_ATTR = "        self.{partial_name} = _DateQuery(\"{field_name}\", query_block)\n"
-BOOLEAN_QUERY_EXT_ATTR = "        self.{partial_name} = _BooleanQuery(\"{field_name}\", query_block)\n"
-DATETIME_QUERY_ATTR = "        self.{partial_name} = _DateQuery(\"{field_name}\", self)\n"
-STRING_QUERY_EXT_ATTR = "        self.{partial_name} = _StringQuery(\"{field_name}\", query_block)\n"
-STRING_QUERY_ATTR = "        self.{partial_name} = _StringQuery(\"{field_name}\", self)\n"
-GEOMETRY_QUERY_ATTR = "        self.{partial_name} = _SpatialQuery(\"{field_name}\", query_block)\n"
-EXTENSION_ATTR = "\n        self.{jsond_prefix} = {class_name}(self)"
+SORTABLE_IS_NULL_ATTR = "        self.{partial_name} = _NullCheck(registry[\"{partial_name}\"], query_block)\n"
+DATETIME_QUERY_EXT_ATTR = "        self.{partial_name} = _DateQuery(registry[\"{partial_name}\"], query_block)\n"
+BOOLEAN_QUERY_EXT_ATTR = "        self.{partial_name} = _BooleanQuery(registry[\"{partial_name}\"], query_block)\n"
+DATETIME_QUERY_ATTR = "        self.{partial_name} = _DateQuery(registry[\"{partial_name}\"], self)\n"
+STRING_QUERY_EXT_ATTR = "        self.{partial_name} = _StringQuery(registry[\"{partial_name}\"], query_block)\n"
+STRING_QUERY_ATTR = "        self.{partial_name} = _StringQuery(registry[\"{partial_name}\"], self)\n"
+GEOMETRY_QUERY_ATTR = "        self.{partial_name} = _SpatialQuery(registry[\"{partial_name}\"], query_block)\n"
+FIELD_METADATA = "        \"{partial_name}\": _FieldMetadata(\"{field_name}\", \"{field_type}\"),\n"
+FIELD_ACCESSOR = "\n        \"{field_name}\": attrgetter(\"{jsond_prefix}.{partial_name}\"),"
+EXTENSION_ATTR = "\n    {jsond_prefix} = _LazyExtension({class_name})"
 ATTR_DOC = "    {partial_name} : {class_name}\n        datetime query interface for searching items by the end_datetime field"
 
 
-def build_enum(field_name: str, enum_object: dict, full_enum_name=False, add_unique=False, field_description=""):
+def build_enum(field_name: str, enum_object: dict, full_enum_name=False, field_description=""):
     prefix = ""
     suffix = ""
     if full_enum_name and ":" in field_name:
@@ -41,24 +46,18 @@ def build_enum(field_name: str, enum_object: dict, full_enum_name=False, add_uni
         field_name = field_name.split(":")[1]
     class_name = prefix + "".join([x.capitalize() for x in field_name.split("_")]) + suffix
     member_definitions = ""
-    custom_methods = ""
     for x in enum_object["enum"]:
         member = str(x).replace("-", "_").replace(" ", "_").strip()
         member_definitions += ENUM_MEMBERS.format(member=member, value=x)
-        if add_unique:
-            custom_methods += enum_custom_method_template.substitute(member=member, class_name=class_name) + "\n"
 
     field_description_name = prefix + " " + " ".join([x.capitalize() for x in field_name.strip().split("_")])
     field_description_name = field_description_name.strip()
-    enum_query_description = f"\n    \"\"\"\n    {field_description_name} Enum Query Interface\n    \"\"\"\n"
-    if field_description:
-        enum_query_description = f"\n    \"\"\"\n    {field_description_name} Enum Query Interface\n    {field_description}\n    \"\"\"\n"
     enum_description = f"\n    \"\"\"\n    {field_description_name} Enum\n    \"\"\"\n"
+    if field_description:
+        enum_description = f"\n    \"\"\"\n    {field_description_name} Enum\n    {field_description}\n    \"\"\"\n"
 
     return enum_template.substitute(class_name=class_name,
                                     member_definitions=member_definitions,
-                                    custom_methods=custom_methods,
-                                    enum_query_description=enum_query_description,
                                     enum_description=enum_description), class_name
 
 
@@ -96,8 +95,9 @@ class ExtensionBuilder:
     extension = ""
     class_name = ""
     jsond_prefix = ""
+    field_accessors = ""
 
-    def __init__(self, extension_schema, force_string_enum=False, fields_to_exclude=None, add_unique_enum=False, full_enum_name=False):
+    def __init__(self, extension_schema, force_string_enum=False, fields_to_exclude=None, full_enum_name=False):
         schema_url = extension_schema['$id']
         if fields_to_exclude is None:
             fields_to_exclude = []
@@ -186,6 +186,7 @@ class ExtensionBuilder:
 
         enum_definitions = ""
         attribute_instantiations = ""
+        field_metadata = ""
         extension_attr_docs = ""
         for field_name in field_names:
             if field_name in fields_to_exclude:
@@ -245,61 +246,67 @@ class ExtensionBuilder:
                     continue
             if field_obj["type"] == "number" or field_obj["type"] == "integer":
                 is_int = field_obj["type"] == "integer"
-                attribute_instantiations += number_query_attr_template.substitute(field_name=field_name,
-                                                                                  partial_name=partial_name,
-                                                                                  min_value=min_value,
-                                                                                  max_value=max_value,
-                                                                                  is_int=is_int)
+                field_metadata += number_field_metadata_template.substitute(field_name=field_name,
+                                                                            partial_name=partial_name,
+                                                                            min_value=min_value,
+                                                                            max_value=max_value,
+                                                                            is_int=is_int)
+                attribute_instantiations += number_query_attr_template.substitute(partial_name=partial_name)
                 extension_attr_docs += number_attr_doc(partial_name=partial_name,
                                                        field_name=field_name,
                                                        min_value=min_value,
                                                        max_value=max_value,
                                                        is_int=is_int)
             elif field_obj["type"] == "string" and "format" in field_obj and field_obj["format"] == "date-time":
-                attribute_instantiations += DATETIME_QUERY_EXT_ATTR.format(field_name=field_name,
-                                                                           partial_name=partial_name)
+                field_metadata += FIELD_METADATA.format(field_name=field_name, partial_name=partial_name, field_type="datetime")
+                attribute_instantiations += DATETIME_QUERY_EXT_ATTR.format(partial_name=partial_name)
                 extension_attr_docs += other_attr_doc(partial_name=partial_name, class_name="_DateQuery", field_name=field_name)
             elif field_obj["type"] == "string" and "enum" in field_obj and not force_string_enum and not any(s[0].isdigit() for s in field_obj["enum"]):
                 # landsat enum -> not any(s[0].isdigit() for s in field_obj["enum"])
-                enum_definition, class_name = build_enum(field_name, field_obj, full_enum_name=full_enum_name, add_unique=add_unique_enum, field_description=field_description)
+                enum_definition, class_name = build_enum(field_name, field_obj, full_enum_name=full_enum_name, field_description=field_description)
                 enum_definitions += enum_definition
                 enum_definitions += "\n\n"
-                attribute_instantiations += enum_query_attr_template.substitute(field_name=field_name,
-                                                                                partial_name=partial_name,
-                                                                                class_name=class_name)
-                e_class = f"_{class_name}Query"
-                extension_attr_docs += other_attr_doc(partial_name=partial_name, class_name=e_class, field_name=field_name)
+                field_metadata += enum_field_metadata_template.substitute(field_name=field_name,
+                                                                          partial_name=partial_name,
+                                                                          class_name=class_name)
+                attribute_instantiations += enum_query_attr_template.substitute(partial_name=partial_name)
+                extension_attr_docs += other_attr_doc(partial_name=partial_name, class_name="_EnumQuery", field_name=field_name)
             elif field_obj["type"] == "string":
-                attribute_instantiations += STRING_QUERY_EXT_ATTR.format(field_name=field_name,
-                                                                         partial_name=partial_name)
+                field_metadata += FIELD_METADATA.format(field_name=field_name, partial_name=partial_name, field_type="string")
+                attribute_instantiations += STRING_QUERY_EXT_ATTR.format(partial_name=partial_name)
                 extension_attr_docs += other_attr_doc(partial_name=partial_name,
                                                       class_name="_StringQuery",
                                                       field_name=field_name)
             elif field_obj["type"] == "boolean":
-                attribute_instantiations += BOOLEAN_QUERY_EXT_ATTR.format(field_name=field_name,
-                                                                          partial_name=partial_name)
+                field_metadata += FIELD_METADATA.format(field_name=field_name, partial_name=partial_name, field_type="boolean")
+                attribute_instantiations += BOOLEAN_QUERY_EXT_ATTR.format(partial_name=partial_name)
                 extension_attr_docs += other_attr_doc(partial_name=partial_name,
                                                       class_name="_BooleanQuery",
                                                       field_name=field_name)
             elif field_obj["type"] == "geometry":
-                attribute_instantiations += GEOMETRY_QUERY_ATTR.format(field_name=field_name,
-                                                                       partial_name=partial_name)
+                field_metadata += FIELD_METADATA.format(field_name=field_name, partial_name=partial_name, field_type="geometry")
+                attribute_instantiations += GEOMETRY_QUERY_ATTR.format(partial_name=partial_name)
                 extension_attr_docs += other_attr_doc(partial_name=partial_name,
                                                       class_name="_SpatialQuery",
                                                       field_name=field_name)
             elif field_obj["type"] in ["array", "object"]:
-                attribute_instantiations += SORTABLE_IS_NULL_ATTR.format(field_name=field_name, partial_name=partial_name)
+                field_metadata += FIELD_METADATA.format(field_name=field_name, partial_name=partial_name, field_type="object")
+                attribute_instantiations += SORTABLE_IS_NULL_ATTR.format(partial_name=partial_name)
                 extension_attr_docs += other_attr_doc(partial_name=partial_name,
                                                       class_name="_NullCheck",
                                                       field_name=field_name)
                 logger.info(f"not producing type {field_obj['type']}")
             else:
                 raise ValueError(f"{field_obj['type']} not a processed type")
+            self.field_accessors += FIELD_ACCESSOR.format(field_name=field_name,
+                                                          jsond_prefix=self.jsond_prefix,
+                                                          partial_name=partial_name)
 
         extension_attr_docs = extension_attr_docs.rstrip()
         self.extension = enum_definitions + extension_template.substitute(class_name=self.class_name,
                                                                           extension_description=extension_description,
                                                                           extension_attr_docs=extension_attr_docs,
+                                                                          field_metadata=field_metadata,
                                                                           attribute_instantiations=attribute_instantiations)
 
 
@@ -311,18 +318,24 @@ def build_query_file(extension_list: list[dict], fields_to_exclude=None, add_uni
 
     extension_definitions = ""
     extension_attributes = ""
+    field_accessors = ""
     for extension_schema in extension_list:
-        extension_builder = ExtensionBuilder(extension_schema, fields_to_exclude=fields_to_exclude, add_unique_enum=add_unique_enum, full_enum_name=full_enum_name)
+        extension_builder = ExtensionBuilder(extension_schema, fields_to_exclude=fields_to_exclude, full_enum_name=full_enum_name)
         extension_definitions += f"\n\n{extension_builder.extension}"
         extension_attributes += EXTENSION_ATTR.format(jsond_prefix=extension_builder.jsond_prefix,
                                                       class_name=extension_builder.class_name)
+        field_accessors += extension_builder.field_accessors
 
     common_props_lines = common_template.substitute().split("\n")
+    common_registry_lines = common_registry_template.substitute().split("\n")
+    common_accessors_lines = common_accessors_template.substitute().split("\n")
     common_docs_props_lines = common_docs_template.substitute().split("\n")
     common_props = "\n"
     common_docs_props = "\n"
     if fields_to_exclude is not None:
         common_props_lines = [line for line in common_props_lines if not any(field in line for field in fields_to_exclude)]
+        common_registry_lines = [line for line in common_registry_lines if not any(field in line for field in fields_to_exclude)]
+        common_accessors_lines = [line for line in common_accessors_lines if not any(field in line for field in fields_to_exclude)]
         for i in range(0, len(common_props_lines)):
             line0 = common_docs_props_lines[i * 2]
             line1 = common_docs_props_lines[i * 2 + 1]
@@ -335,6 +348,8 @@ def build_query_file(extension_list: list[dict], fields_to_exclude=None, add_uni
     sorted_fields_to_include = sorted([f for f in fields_to_exclude if ":" not in f])
     sorted_fields_to_include.extend(sorted([f for f in fields_to_exclude if ":" in f]))
     common_props += "\n".join(common_props_lines)
+    common_registry = "\n" + "\n".join(common_registry_lines)
+    field_accessors = "\n" + "\n".join(common_accessors_lines) + field_accessors
     extension_list_comment = "# None" if len(extension_list) == 0 else "\n".join([f"# {e['$id']}" for e in extension_list])
     fields_to_exclude_comment = "# None" if len(fields_to_exclude) == 0 else "\n".join([f"# {f}" for f in sorted_fields_to_include])
     return query_template.substitute(cqlalchemy_version=__version__,
@@ -344,5 +359,7 @@ def build_query_file(extension_list: list[dict], fields_to_exclude=None, add_uni
                                      add_unique_enum=add_unique_enum,
                                      extension_definitions=extension_definitions,
                                      common_attributes=common_props,
+                                     common_registry=common_registry,
+                                     field_accessors=field_accessors,
                                      common_docs=common_docs_props.rstrip(),
                                      extension_attributes=extension_attributes)
@@ -0,0 +1,479 @@
+import gzip
+import importlib.util
+import io
+import json
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from cqlalchemy.scaffold.build import build_query_file
+from cqlalchemy.stac.query import (_JSON_BACKENDS, QueryBuilder, _binary_encode, _DateTimeEncoder, _isoformat_values,
+                                   query_dump_ndjson)
+
+TEST_DATA = Path(__file__).parent / "test_data"
+BASELINE_PATH = TEST_DATA / "benchmark_baseline.json"
+# set to regenerate benchmark_baseline.json after an intentional change to generated code
+UPDATE_BASELINE = os.environ.get("CQLALCHEMY_UPDATE_BENCHMARK_BASELINE") == "1"
+# object sizes differ between python versions, so baselines are recorded per minor version
+PYTHON_VERSION = f"{sys.version_info.major}.{sys.version_info.minor}"
+EXTENSION_COUNTS = [0, 1, 9, 70]
+# local schemas and their property prefixes, reused with numbered prefixes to reach 70 extensions
+EXTENSION_SCHEMAS = [("eo", "eo"), ("sar", "sar"), ("sat", "sat"), ("view", "view"),
+                     ("landsat", "landsat"), ("mlm", "mlm"), ("planet", "pl")]
+# allowed growth over the baseline before the budget check fails
+TIME_TOLERANCE = 1.5
+MEMORY_TOLERANCE = 1.1
+
+VARIANTS = 10_000
+
+# a 64 vertex circle stands in for a county sized area of interest
+AOI = {
+    "type": "Polygon",
+    "coordinates": [[
+        [-122.0 + 0.4 * math.cos(2 * math.pi * i / 64), 47.5 + 0.3 * math.sin(2 * math.pi * i / 64)]
+        for i in range(64)
+    ] + [[-121.6, 47.5]]],
+}
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def _base_query(q: QueryBuilder) -> QueryBuilder:
+    q.collection.equals("landsat-c2-l2")
+    q.datetime.gte(datetime(2024, 1, 1, tzinfo=timezone.utc))
+    q.datetime.lte(datetime(2024, 12, 31, tzinfo=timezone.utc))
+    q.geometry.intersects(AOI)
+    q.eo.cloud_cover.lt(20)
+    q.platform.in_set(["landsat-8", "landsat-9"])
+    return q
+
+
+@pytest.mark.benchmark
+def test_fork_fan_out():
+    def fresh():
+        dumps = []
+        for i in range(VARIANTS):
+            q = _base_query(QueryBuilder())
+            q.view.off_nadir.lt(i % 90)
+            dumps.append(q.query_dump())
+        return dumps
+
+    def forked():
+        base = _base_query(QueryBuilder())
+        dumps = []
+        for i in range(VARIANTS):
+            q = base.fork()
+            q.view.off_nadir.lt(i % 90)
+            dumps.append(q.query_dump())
+        return dumps
+
+    fresh_seconds, fresh_dumps = _timed(fresh)
+    fork_seconds, fork_dumps = _timed(forked)
+    print(f"\n{VARIANTS} variants: fresh {fresh_seconds:.3f}s, fork {fork_seconds:.3f}s "
+          f"({fresh_seconds / fork_seconds:.1f}x)")
+    assert fresh_dumps == fork_dumps
+    assert fork_seconds < fresh_seconds
+
+
+@pytest.mark.benchmark
+def test_unchecked_predicates():
+    predicates = 10_000
+    platforms = ["landsat-7", "landsat-8", "landsat-9"]
+    setters = {
+        "number": lambda q, i: q.eo.cloud_cover.lt(i % 100),
+        "string": lambda q, i: q.landsat.wrs_path.equals(str(i % 233)),
+        "in_set": lambda q, i: q.platform.in_set(platforms),
+        "geometry": lambda q, i: q.geometry.intersects(AOI),
+    }
+
+    def set_predicates(q: QueryBuilder, setter):
+        for i in range(predicates):
+            setter(q, i)
+
+    checked_total = trusted_total = 0.0
+    for name, setter in setters.items():
+        checked_seconds, _ = _timed(lambda: set_predicates(QueryBuilder(), setter))
+        trusted_seconds, _ = _timed(lambda: set_predicates(QueryBuilder(trusted=True), setter))
+        print(f"\n{name} predicate: checked {checked_seconds * 1e6 / predicates:.2f}us, "
+              f"trusted {trusted_seconds * 1e6 / predicates:.2f}us", end="")
+        checked_total += checked_seconds
+        trusted_total += trusted_seconds
+    assert trusted_total < checked_total
+
+
+def _circle(vertices: int) -> dict:
+    ring = [[-122.0 + 0.4 * math.cos(2 * math.pi * i / vertices), 47.5 + 0.3 * math.sin(2 * math.pi * i / vertices)]
+            for i in range(vertices)]
+    return {"type": "Polygon", "coordinates": [ring + [ring[0]]]}
+
+
+@pytest.mark.benchmark
+def test_query_dump_allocations():
+    dumps = 1_000
+    q = _base_query(QueryBuilder())
+    q.view.off_nadir.gt(5)
+    q.view.off_nadir.lt(30)
+    q.view.off_nadir.not_equals(10)
+    q.filter((q.gsd > 10) | (q.gsd < 2))
+    q.landsat.wrs_path.is_null()
+    q._query_dump(False, None)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        # keep every dump alive so each allocation is still counted at the second snapshot
+        retained = [q._query_dump(False, None) for _ in range(dumps)]
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    blocks = sum(x.count_diff for x in stats) / dumps
+    size = sum(x.size_diff for x in stats) / dumps
+    print(f"\nquery_dump allocations: {blocks:.1f} blocks, {size:.0f} bytes per call")
+    # property nodes are shared rather than allocated per dump
+    assert retained[0]["filter"]["args"][0]["args"][0] is retained[-1]["filter"]["args"][0]["args"][0]
+
+
+@pytest.mark.benchmark
+def test_spliced_json_fragments():
+    changes = 20
+    q = QueryBuilder(trusted=True)
+    q.geometry.intersects(_circle(50_000))
+    q.collection.equals("landsat-c2-l2")
+    q.datetime.gte(datetime(2024, 1, 1, tzinfo=timezone.utc))
+    q.datetime.lte(datetime(2024, 12, 31, tzinfo=timezone.utc))
+    q.platform.in_set(["landsat-8", "landsat-9"])
+    q.eo.cloud_cover.lt(20)
+    q.view.off_nadir.lt(10)
+    q.view.sun_elevation.gt(20)
+    q.landsat.wrs_path.equals("046")
+    q.landsat.wrs_row.equals("027")
+    q.sat.orbit_state.equals("descending")
+    q.gsd.lte(30)
+
+    def full():
+        for i in range(changes):
+            q.eo.cloud_cover.lt(i % 100)
+            json.dumps(q.query_dump(), cls=_DateTimeEncoder)
+
+    def spliced():
+        for i in range(changes):
+            q.eo.cloud_cover.lt(i % 100)
+            q.query_dump_json()
+
+    full_seconds, _ = _timed(full)
+    spliced_seconds, _ = _timed(spliced)
+    print(f"\n50k vertex query, one field changed: full encode {full_seconds * 1e3 / changes:.2f}ms, "
+          f"spliced {spliced_seconds * 1e3 / changes:.2f}ms")
+    assert q.query_dump_json() == json.dumps(q.query_dump(), separators=(",", ":"), cls=_DateTimeEncoder)
+    assert spliced_seconds < full_seconds
+
+
+@pytest.mark.benchmark
+def test_query_dump_bytes():
+    changes = 20
+    q = QueryBuilder(trusted=True)
+    q.geometry.intersects(_circle(50_000))
+    q.datetime.gte(datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+    def encoded_json():
+        for i in range(changes):
+            q.eo.cloud_cover.lt(i % 100)
+            q.query_dump_json().encode()
+
+    def as_bytes():
+        for i in range(changes):
+            q.eo.cloud_cover.lt(i % 100)
+            q.query_dump_bytes()
+
+    json_seconds, _ = _timed(encoded_json)
+    bytes_seconds, _ = _timed(as_bytes)
+    print(f"\n50k vertex query, one field changed: query_dump_json().encode() {json_seconds * 1e3 / changes:.2f}ms, "
+          f"query_dump_bytes() {bytes_seconds * 1e3 / changes:.2f}ms")
+    assert q.query_dump_bytes() == q.query_dump_json().encode()
+
+
+@pytest.mark.benchmark
+def test_bounded_query_summary():
+    q = QueryBuilder(trusted=True)
+    q.geometry.intersects(_circle(50_000))
+    q.platform.in_set([f"platform-{i}" for i in range(10_000)])
+    q.datetime.gte(datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+    # bypass the memoized summary
+    full_seconds, full = _timed(lambda: q._query_summary(False, None, True, None, None))
+    bounded_seconds, bounded = _timed(lambda: q._query_summary(False, None, True, 80, 1_000))
+    print(f"\nquery_summary: full {len(full):,} chars in {full_seconds * 1e3:.1f}ms, "
+          f"bounded {len(bounded):,} chars in {bounded_seconds * 1e3:.1f}ms")
+    assert len(bounded) <= 1_000
+    assert bounded_seconds < full_seconds
+
+
+@pytest.mark.benchmark
+def test_json_backends():
+    datetime_heavy = QueryBuilder()
+    for i, field_name in enumerate(["datetime", "created", "updated", "start_datetime", "end_datetime"]):
+        datetime_heavy.field(field_name).gte(datetime(2020 + i, 1, 1, tzinfo=timezone.utc))
+        datetime_heavy.field(field_name).lt(datetime(2024, 1, 1, 12, i, tzinfo=timezone.utc))
+    for i in range(20):
+        datetime_heavy.filter(datetime_heavy.created > datetime(2023, 1, i + 1, tzinfo=timezone.utc))
+    geometry_heavy = QueryBuilder(trusted=True)
+    geometry_heavy.geometry.intersects(_circle(20_000))
+    geometry_heavy.datetime.gte(datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+    for payload_name, q, repeat in [("datetime", datetime_heavy, 2_000), ("geometry", geometry_heavy, 20)]:
+        query = q.query_dump()
+        legacy = _per_call_seconds(lambda: json.dumps(query, cls=_DateTimeEncoder), repeat)
+        print(f"\n{payload_name} heavy: json.dumps with _DateTimeEncoder {legacy * 1e6:.1f}us", end="")
+        for backend in _JSON_BACKENDS.values():
+            # the stdlib backend gets datetimes already converted, as query_dump_json builds them
+            payload = _isoformat_values(query) if backend.name == "stdlib" else query
+            seconds = _per_call_seconds(lambda: backend.dumps(payload), repeat)
+            assert json.loads(backend.dumps(payload)) == json.loads(json.dumps(query, cls=_DateTimeEncoder))
+            print(f", {backend.name} {seconds * 1e6:.1f}us", end="")
+
+
+@pytest.mark.benchmark
+def test_streamed_dump_memory():
+    q = QueryBuilder(trusted=True)
+    q.geometry.intersects(_circle(200_000))
+    q.platform.in_set([f"platform-{i}" for i in range(50_000)])
+    q.datetime.gte(datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+    class _Discard(io.TextIOBase):
+        def write(self, text):
+            return len(text)
+
+    def peak_bytes(func):
+        tracemalloc.start()
+        try:
+            func()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    # the builder already holds the payload, so only the encoder's working memory is traced.
+    # query_dump_to runs first, as query_dump_json fills the fragment cache it would reuse
+    streamed = peak_bytes(lambda: q.query_dump_to(_Discard()))
+    in_memory = peak_bytes(lambda: _Discard().write(q._query_dump_json(False, None, False, None)))
+    print(f"\n200k vertex query: query_dump_json peak {in_memory / 1e6:.1f}MB, "
+          f"query_dump_to peak {streamed / 1e6:.2f}MB")
+    assert streamed * 10 < in_memory
+
+
+@pytest.mark.benchmark
+def test_binary_encoding():
+    typical = _base_query(QueryBuilder())
+    typical.filter((typical.gsd > 10) | (typical.gsd < 2))
+    typical.datetime.sort_by_desc()
+    geometry_heavy = QueryBuilder(trusted=True)
+    geometry_heavy.geometry.intersects(_circle(20_000))
+    geometry_heavy.datetime.gte(datetime(2024, 1, 1, tzinfo=timezone.utc))
+    in_set_heavy = QueryBuilder(trusted=True)
+    in_set_heavy.platform.in_set([f"platform-{i}" for i in range(5_000)])
+    in_set_heavy.eo.cloud_cover.lt(20)
+
+    for payload_name, q, repeat in [("typical", typical, 200), ("geometry", geometry_heavy, 3),
+                                    ("in_set", in_set_heavy, 10)]:
+        query = q.query_dump()
+        encoded = q.query_dump_binary()
+        text = q.query_dump_bytes()
+        encode = _per_call_seconds(lambda: _binary_encode(bytearray(), query, QueryBuilder._field_order), repeat)
+        decode = _per_call_seconds(lambda: QueryBuilder.query_load_binary(encoded), repeat)
+        print(f"\n{payload_name}: binary {len(encoded):,} bytes, encode {encode * 1e6:.0f}us, "
+              f"decode {decode * 1e6:.0f}us; json {len(text):,} bytes", end="")
+        for backend in _JSON_BACKENDS.values():
+            payload = _isoformat_values(query) if backend.name == "stdlib" else query
+            seconds = _per_call_seconds(lambda: backend.dumps_bytes(payload), repeat)
+            print(f", {backend.name} encode {seconds * 1e6:.0f}us", end="")
+        print(f", json.loads {_per_call_seconds(lambda: json.loads(text), repeat) * 1e6:.0f}us", end="")
+        assert len(encoded) < len(text)
+
+
+@pytest.mark.benchmark
+def test_ndjson_batches():
+    payloads = 20_000
+    specs = [{"collection": {"equals": "landsat-c2-l2"},
+              "eo:cloud_cover": {"lt": i % 100},
+              "view:off_nadir": {"lte": i % 45},
+              "platform": {"in_set": ["landsat-8", "landsat-9"]}} for i in range(payloads)]
+
+    def one_at_a_time():
+        out = io.StringIO()
+        for spec in specs:
+            out.write(QueryBuilder().apply(spec).query_dump_json() + "\n")
+        return out.getvalue()
+
+    def batched(processes=None):
+        out = io.BytesIO()
+        query_dump_ndjson(specs, out, processes=processes)
+        return out.getvalue().decode()
+
+    single_seconds, expected = _timed(one_at_a_time)
+    batched_seconds, result = _timed(batched)
+    pool_seconds, pooled = _timed(lambda: batched(processes=4))
+    print(f"\n{payloads} payloads: query_dump_json per builder {single_seconds:.2f}s, "
+          f"query_dump_ndjson {batched_seconds:.2f}s, with 4 processes {pool_seconds:.2f}s")
+    assert result == expected == pooled
+    assert batched_seconds < single_seconds
+
+
+def _county_boundary(vertices: int) -> dict:
+    # a jagged, county sized ring like the King County footprint in the README, with full
+    # precision coordinates so compression isn't flattered by round numbers
+    rng = random.Random(7)
+    ring = []
+    for i in range(vertices):
+        angle = 2 * math.pi * i / vertices
+        radius = 0.35 + 0.05 * math.sin(7 * angle) + rng.uniform(-0.01, 0.01)
+        ring.append([-121.8 + radius * math.cos(angle), 47.45 + 0.7 * radius * math.sin(angle)])
+    return {"type": "Polygon", "coordinates": [ring + [ring[0]]]}
+
+
+@pytest.mark.benchmark
+def test_gzip_body():
+    q = QueryBuilder(trusted=True)
+    q.collection.equals("landsat-c2-l2")
+    q.geometry.intersects(_county_boundary(100_000))
+    q.datetime.gte(datetime(2024, 1, 1, tzinfo=timezone.utc))
+    q._fragment_cache = None
+    encode, body = _timed(lambda: q._spliced_query_dump_bytes(False, None))
+    print(f"\ncounty boundary, 100k vertices: {len(body) / 1e6:.2f}MB, encode {encode * 1e3:.0f}ms", end="")
+
+    def compress(level):
+        # drop the memoized body; the cached geometry fragment is kept, so this times compression
+        q._dump_cache = None
+        return q.query_dump_gzip(compresslevel=level).body
+
+    for level in [1, 6, 9]:
+        seconds, compressed = _timed(lambda: compress(level))
+        assert gzip.decompress(compressed) == body
+        print(f"; gzip {level}: {len(compressed) / 1e6:.2f}MB ({len(body) / len(compressed):.1f}x) "
+              f"in {seconds * 1e3:.0f}ms", end="")
+
+
+def _extension_schemas(count: int) -> list[dict]:
+    schemas = []
+    for i in range(count):
+        file_prefix, prefix = EXTENSION_SCHEMAS[i % len(EXTENSION_SCHEMAS)]
+        text = (TEST_DATA / f"{file_prefix}.schema.json").read_text()
+        if i >= len(EXTENSION_SCHEMAS):
+            text = text.replace(f'"{prefix}:', f'"{prefix}{i}:').replace(f'/{prefix}:', f'/{prefix}{i}:')
+        schemas.append(json.loads(text))
+    return schemas
+
+
+def _load_builder(module_path: Path) -> type:
+    spec = importlib.util.spec_from_file_location(module_path.stem, module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.QueryBuilder
+
+
+def _generated_builder(count: int, tmp_path: Path) -> type:
+    module_path = tmp_path / f"query_{count}_extensions.py"
+    module_path.write_text(build_query_file(_extension_schemas(count), full_enum_name=True))
+    return _load_builder(module_path)
+
+
+def _populate(q):
+    q.collection.equals("landsat-c2-l2")
+    q.datetime.gte(datetime(2024, 1, 1, tzinfo=timezone.utc))
+    # an is_null predicate on every extension field, which also builds every extension
+    for field_name in q._field_accessors:
+        if ":" in field_name:
+            q.field(field_name).is_null()
+    return q
+
+
+def _per_call_seconds(func, repeat: int) -> float:
+    best = math.inf
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / repeat
+
+
+def _calibration_seconds() -> float:
+    # a fixed pure python workload, so timings are compared in units of this machine's speed
+    keys = [f"key_{i}" for i in range(32)]
+    return _per_call_seconds(lambda: [{k: [k] for k in keys} for _ in range(8)], 2_000)
+
+
+def _measure(builder_class: type) -> dict:
+    builders = 50
+    # warm up first, so one-time allocations such as interned strings are not counted per builder
+    _populate(builder_class())
+    tracemalloc.start()
+    try:
+        retained = [_populate(builder_class()) for _ in range(builders)]
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    populated = retained[0]
+    # retained size of an empty builder, whose extensions are not built yet
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        empty = [builder_class() for _ in range(builders)]
+        empty_bytes = (tracemalloc.get_traced_memory()[0] - before) // len(empty)
+    finally:
+        tracemalloc.stop()
+    return {
+        "construct": _per_call_seconds(builder_class, 2_000),
+        # time the build itself rather than the memoized lookup
+        "query_dump": _per_call_seconds(lambda: populated._query_dump(False, None), 200),
+        "peak_bytes_per_builder": peak // builders,
+        "empty_bytes_per_builder": empty_bytes,
+    }
+
+
+@pytest.mark.benchmark
+def test_builder_budgets(tmp_path):
+    calibration = _calibration_seconds()
+    builders = {f"{count} extensions": _generated_builder(count, tmp_path) for count in EXTENSION_COUNTS}
+    builders["cqlalchemy.stac.query"] = QueryBuilder
+    builders["test_data/query_1.py"] = _load_builder(TEST_DATA / "query_1.py")
+    results = {}
+    for name, builder_class in builders.items():
+        measured = _measure(builder_class)
+        results[name] = {
+            "construct": round(measured["construct"] / calibration, 4),
+            "query_dump": round(measured["query_dump"] / calibration, 4),
+            "peak_bytes_per_builder": measured["peak_bytes_per_builder"],
+            "empty_bytes_per_builder": measured["empty_bytes_per_builder"],
+        }
+        print(f"\n{name}: construct {measured['construct'] * 1e6:.2f}us, "
+              f"query_dump {measured['query_dump'] * 1e6:.2f}us, "
+              f"peak {measured['peak_bytes_per_builder']} bytes per builder, "
+              f"{measured['empty_bytes_per_builder']} bytes per empty builder", end="")
+
+    baselines = json.loads(BASELINE_PATH.read_text())
+    if UPDATE_BASELINE:
+        baselines[PYTHON_VERSION] = results
+        BASELINE_PATH.write_text(json.dumps(baselines, indent=2) + "\n")
+        return
+    baseline = baselines.get(PYTHON_VERSION)
+    if baseline is None:
+        pytest.skip(f"no benchmark baseline for python {PYTHON_VERSION}, "
+                    "set CQLALCHEMY_UPDATE_BENCHMARK_BASELINE=1 to record one")
+    regressions = []
+    for name, budget in baseline.items():
+        for metric, limit in budget.items():
+            tolerance = MEMORY_TOLERANCE if metric.endswith("bytes_per_builder") else TIME_TOLERANCE
+            if results[name][metric] > limit * tolerance:
+                regressions.append(f"{name} {metric}: {results[name][metric]} > {limit} baseline")
+    assert not regressions, "\n".join(regressions)
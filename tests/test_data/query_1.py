@@ -12,21 +12,46 @@
 # unique Enum classes generated:
 # False
 #
-# generated on 2025-06-09
+# generated on 2026-10-18
 
 from __future__ import annotations
 
+import gzip
+import hashlib
+import io
 import json
 import math
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta, timezone
 from enum import Enum
+from itertools import chain, islice
 from json import JSONEncoder
-from typing import Optional, Union
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Any, Callable, Generic, Iterable, Iterator, NamedTuple, Optional, TypeVar, Union
 
 import shapely
+from shapely.errors import ShapelyError
 from shapely.geometry import shape
 from shapely.geometry.base import BaseGeometry
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_ExtensionT = TypeVar("_ExtensionT", bound="_Extension")
+# when True, enum queries accept member shortcuts, e.g. `q.sar.observation_direction.left()`
+_ENUM_MEMBER_SHORTCUTS = False
+
 
 class _DateTimeEncoder(JSONEncoder):
     def default(self, obj):
@@ -34,16 +59,673 @@ class _DateTimeEncoder(JSONEncoder):
             return obj.isoformat()
 
 
-def _query_summary_value(value):
+class _PropertyNode(dict):
+    """
+    the `{"property": name}` node of a field. one read-only instance per field name is shared
+    by every memoized query_dump body, so building a predicate doesn't allocate it again. the public
+    query_dump and property_obj return plain dicts.
+    """
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("property nodes are shared between queries and can't be modified. copy it first")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = _read_only
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+_PROPERTY_NODES: dict[str, _PropertyNode] = {}
+
+
+def _property_node(field_name: str) -> _PropertyNode:
+    node = _PROPERTY_NODES.get(field_name)
+    if node is None:
+        node = _PROPERTY_NODES[field_name] = _PropertyNode(property=field_name)
+    return node
+
+
+def _isoformat_values(query):
+    # replace datetimes in a predicate with RFC 3339 strings so the encoder never calls default()
+    if type(query) is _PropertyNode:
+        return query
+    if isinstance(query, dict):
+        return {k: _isoformat_values(v) for k, v in query.items()}
+    if isinstance(query, list):
+        return [_isoformat_values(x) for x in query]
+    if isinstance(query, (date, datetime)):
+        return query.isoformat()
+    return query
+
+
+def _canonical_json(query) -> str:
+    return json.dumps(query, sort_keys=True, separators=(",", ":"))
+
+
+def _canonical_value(value):
+    # aware datetimes as UTC with a Z suffix and whole floats as ints, so 20 and 20.0 compare
+    # equal. naive datetimes are kept as-is, converting them would depend on the host timezone
+    if isinstance(value, datetime):
+        if value.tzinfo is None or value.utcoffset() is None:
+            return value.isoformat()
+        return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _sorted_unique(values: list) -> list:
+    unique = {_canonical_json(x): x for x in values}
+    return [unique[key] for key in sorted(unique)]
+
+
+def _canonical_ring(ring: list, counterclockwise: bool) -> list:
+    # start at the lowest vertex and wind counterclockwise for exteriors, clockwise for holes
+    if len(ring) > 1 and ring[0] == ring[-1]:
+        ring = ring[:-1]
+    if len(ring) < 3:
+        return ring
+    start = min(range(len(ring)), key=ring.__getitem__)
+    ring = ring[start:] + ring[:start]
+    area = sum(a[0] * b[1] - b[0] * a[1] for a, b in zip(ring, ring[1:] + ring[:1]))
+    if (area > 0) != counterclockwise:
+        ring = ring[:1] + ring[:0:-1]
+    return ring + ring[:1]
+
+
+def _canonical_polygon(rings: list) -> list:
+    if not rings:
+        return rings
+    return [_canonical_ring(rings[0], True)] + _sorted_unique([_canonical_ring(x, False) for x in rings[1:]])
+
+
+def _normalize_filter(node):
+    """
+    flatten and/or nodes into a parent with the same op, and replace and/or nodes that have a
+    single arg with that arg. the order of args is kept.
+    """
+    if not isinstance(node, dict) or node.get("op") not in ("and", "or", "not"):
+        return node
+    op = node["op"]
+    args = [_normalize_filter(x) for x in node["args"]]
+    if op == "not":
+        return {"op": op, "args": args}
+    flat = []
+    for arg in args:
+        # args were normalized first, so a same-op child is already flat
+        if isinstance(arg, dict) and arg.get("op") == op:
+            flat.extend(arg["args"])
+        else:
+            flat.append(arg)
+    if len(flat) == 1:
+        return flat[0]
+    return {"op": op, "args": flat}
+
+
+def _copy_tree(value):
+    """
+    copy the dicts and lists of a memoized query_dump body, with shared property nodes as plain
+    dicts. tuples, e.g. geometry coordinates, are immutable and kept.
+    """
+    if isinstance(value, dict):
+        return {k: _copy_tree(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_tree(x) for x in value]
+    return value
+
+
+def _normalize_query(query: Optional[dict]) -> Optional[dict]:
+    if query is None:
+        return None
+    return {**query, "filter": _normalize_filter(query["filter"])}
+
+
+class _PropertyConstraint:
+    """
+    what a conjunction of predicates requires of one property, for contradiction detection
+    """
+    __slots__ = ("lower", "lower_inclusive", "upper", "upper_inclusive", "allowed", "excluded", "null", "not_null")
+
+    def __init__(self):
+        self.lower = self.upper = self.allowed = None
+        self.lower_inclusive = self.upper_inclusive = True
+        self.excluded = []
+        self.null = self.not_null = False
+
+    def add(self, op: str, value):
+        if op == "isNull":
+            self.null = True
+            return
+        # any other predicate is false for a null property
+        self.not_null = True
+        if op == "=":
+            self.add("in", [value])
+        elif op == "in":
+            values = list(value)
+            self.allowed = values if self.allowed is None else [x for x in self.allowed if x in values]
+        elif op == "!=":
+            self.excluded.append(value)
+        elif op == "not in":
+            self.excluded.extend(value)
+        elif op in (">", ">="):
+            if self.lower is None or value > self.lower or (value == self.lower and op == ">"):
+                self.lower, self.lower_inclusive = value, op == ">="
+        elif op in ("<", "<="):
+            if self.upper is None or value < self.upper or (value == self.upper and op == "<"):
+                self.upper, self.upper_inclusive = value, op == "<="
+
+    def _within(self, value) -> bool:
+        if self.lower is not None and (value < self.lower or (value == self.lower and not self.lower_inclusive)):
+            return False
+        if self.upper is not None and (value > self.upper or (value == self.upper and not self.upper_inclusive)):
+            return False
+        return value not in self.excluded
+
+    def is_empty(self) -> bool:
+        if self.null and self.not_null:
+            return True
+        if self.lower is not None and self.upper is not None:
+            if self.lower > self.upper or (self.lower == self.upper and not (self.lower_inclusive and self.upper_inclusive)):
+                return True
+            if self.lower == self.upper and self.lower in self.excluded:
+                return True
+        return self.allowed is not None and not any(self._within(x) for x in self.allowed)
+
+
+def _contradicts(predicates: list) -> bool:
+    constraints = {}
+    for predicate in predicates:
+        op, args = predicate.get("op"), predicate.get("args", [])
+        if op == "not" and len(args) == 1 and isinstance(args[0], dict) and args[0].get("op") == "in":
+            op, args = "not in", args[0]["args"]
+        if len(args) == 0 or not isinstance(args[0], dict) or "property" not in args[0]:
+            continue
+        constraint = constraints.setdefault(args[0]["property"], _PropertyConstraint())
+        try:
+            if op == "isNull":
+                constraint.add(op, None)
+            elif op in ("=", "!=", "<", "<=", ">", ">=", "in", "not in") and len(args) == 2:
+                constraint.add(op, args[1])
+            else:
+                # like, s_intersects and other operations only require a value
+                constraint.not_null = True
+        except TypeError:
+            # values that can't be compared, e.g. a number and a string, prove nothing
+            continue
+    for constraint in constraints.values():
+        try:
+            if constraint.is_empty():
+                return True
+        except TypeError:
+            continue
+    return False
+
+
+def _unsatisfiable(node, context: tuple = ()) -> bool:
+    """
+    True if no item can match a normalized filter, given the `context` predicates it is
+    and-ed with. an 'or' fails only if each of its args contradicts the context, and the
+    predicates of an 'and' are checked together with the context.
+    """
+    op = node.get("op")
+    if op == "or":
+        return all(_unsatisfiable(x, context) for x in node["args"])
+    if op == "and":
+        predicates = context + tuple(x for x in node["args"] if x.get("op") not in ("and", "or"))
+        if _contradicts(list(predicates)):
+            return True
+        return any(_unsatisfiable(x, predicates) for x in node["args"] if x.get("op") in ("and", "or"))
+    return _contradicts(list(context) + [node])
+
+
+def _domain_value(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+def _is_tautology(predicate, metadata: Callable[[str], Optional[_FieldMetadata]]) -> bool:
+    """
+    True if a predicate holds for every value its property's schema allows, e.g. `>= 0` on a
+    property with a minimum of 0, or an 'in' that lists every enum member.
+    """
+    op, args = predicate.get("op"), predicate.get("args", [])
+    if op == "not" and len(args) == 1 and isinstance(args[0], dict) and args[0].get("op") == "in":
+        op, args = "not in", args[0]["args"]
+    if len(args) != 2 or not isinstance(args[0], dict) or "property" not in args[0]:
+        return False
+    meta = metadata(args[0]["property"])
+    if meta is None:
+        return False
+    value = args[1]
+    if meta.enum_values:
+        if op == "in":
+            return meta.enum_values.issubset(_domain_value(x) for x in value)
+        if op == "not in":
+            return meta.enum_values.isdisjoint(_domain_value(x) for x in value)
+        if op == "!=":
+            return _domain_value(value) not in meta.enum_values
+        return False
+    low, high = meta.min_value, meta.max_value
+    try:
+        if op == ">=":
+            return low is not None and value <= low
+        if op == ">":
+            return low is not None and value < low
+        if op == "<=":
+            return high is not None and value >= high
+        if op == "<":
+            return high is not None and value > high
+        if op == "!=":
+            return (low is not None and value < low) or (high is not None and value > high)
+    except TypeError:
+        # a value that can't be compared with the schema limits proves nothing
+        return False
+    return False
+
+
+def _drop_tautologies(node, metadata: Callable[[str], Optional[_FieldMetadata]]):
+    """
+    remove the predicates of a normalized filter that hold for every value the schema allows.
+    an 'and' keeps the args that remain, and an 'or' with a tautology arg is a tautology.
+    returns None if the whole filter is a tautology.
+    """
+    op = node.get("op")
+    if op in ("and", "or"):
+        args = [_drop_tautologies(x, metadata) for x in node["args"]]
+        if op == "or" and any(x is None for x in args):
+            return None
+        args = [x for x in args if x is not None]
+        if not args:
+            return None
+        return _normalize_filter({"op": op, "args": args})
+    return None if _is_tautology(node, metadata) else node
+
+
+def _canonical_query(query):
+    """
+    rewrite a query_dump body so semantically identical queries are equal: and/or args and
+    in_set values sorted and deduplicated, datetimes in UTC, whole floats as ints and polygon
+    rings in a fixed start vertex and winding order.
+    """
+    if isinstance(query, dict):
+        canonical = {k: _canonical_query(v) for k, v in query.items()}
+        op = canonical.get("op")
+        args = canonical.get("args")
+        if op in ("and", "or"):
+            canonical["args"] = _sorted_unique(args)
+            if len(canonical["args"]) == 1:
+                return canonical["args"][0]
+        elif op == "in" and len(args) == 2 and isinstance(args[1], list):
+            canonical["args"] = [args[0], _sorted_unique(args[1])]
+        elif canonical.get("type") == "Polygon":
+            canonical["coordinates"] = _canonical_polygon(canonical["coordinates"])
+        elif canonical.get("type") == "MultiPolygon":
+            canonical["coordinates"] = _sorted_unique([_canonical_polygon(x) for x in canonical["coordinates"]])
+        return canonical
+    if isinstance(query, (list, tuple)):
+        return [_canonical_query(x) for x in query]
+    return _canonical_value(query)
+
+
+# binary query encoding: a header of magic, format version and the crc32 of the builder's field
+# table, then one tagged value. property nodes are written as their index in the field table, common
+# {"op", "args"} nodes as an op code, runs of float positions as packed little-endian doubles and
+# lists of strings (in_set values) as one NUL separated UTF-8 string. naive datetimes, which filters
+# accept, are written without an offset and decode as naive
+_BINARY_MAGIC = b"CQB"
+_BINARY_VERSION = 1
+_BINARY_HEADER = struct.Struct("<3sBI")
+_BINARY_OPS = ("and", "or", "not", "=", "!=", "<", "<=", ">", ">=", "in", "like", "isNull", "s_intersects")
+_BINARY_OP_CODES = {op: i for i, op in enumerate(_BINARY_OPS)}
+(_B_NONE, _B_FALSE, _B_TRUE, _B_INT, _B_FLOAT, _B_STR, _B_DATETIME, _B_DATE,
+ _B_LIST, _B_DICT, _B_FIELD, _B_OP, _B_POSITIONS, _B_STRINGS, _B_NAIVE_DATETIME) = range(15)
+_B_DOUBLE = struct.Struct("<d")
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+
+
+def _write_varint(out: bytearray, value: int):
+    # zigzag, so small negative ints stay short
+    value = value * 2 if value >= 0 else -value * 2 - 1
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _position_size(values) -> int:
+    # the dimension of a list of float positions worth packing, otherwise 0
+    if len(values) < 2 or not isinstance(values[0], (list, tuple)) or len(values[0]) not in (2, 3):
+        return 0
+    size = len(values[0])
+    for position in values:
+        if not isinstance(position, (list, tuple)) or len(position) != size:
+            return 0
+        for x in position:
+            if type(x) is not float:
+                return 0
+    return size
+
+
+def _binary_encode(out: bytearray, value, field_codes: MappingProxyType):
+    if value is None:
+        out.append(_B_NONE)
+    elif value is True or value is False:
+        out.append(_B_TRUE if value else _B_FALSE)
+    elif isinstance(value, int):
+        out.append(_B_INT)
+        _write_varint(out, value)
+    elif isinstance(value, float):
+        out.append(_B_FLOAT)
+        out += _B_DOUBLE.pack(value)
+    elif isinstance(value, str):
+        encoded = value.encode("utf-8")
+        out.append(_B_STR)
+        _write_varint(out, len(encoded))
+        out += encoded
+    elif isinstance(value, datetime) and value.utcoffset() is None:
+        delta = value - _NAIVE_EPOCH
+        out.append(_B_NAIVE_DATETIME)
+        _write_varint(out, (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds)
+    elif isinstance(value, datetime):
+        delta = value - _EPOCH
+        out.append(_B_DATETIME)
+        _write_varint(out, (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds)
+        _write_varint(out, int(value.utcoffset().total_seconds()))
+    elif isinstance(value, date):
+        out.append(_B_DATE)
+        _write_varint(out, value.toordinal())
+    elif isinstance(value, dict):
+        if len(value) == 1 and value.get("property") in field_codes:
+            out.append(_B_FIELD)
+            _write_varint(out, field_codes[value["property"]])
+        elif len(value) == 2 and value.get("op") in _BINARY_OP_CODES and isinstance(value.get("args"), list):
+            out.append(_B_OP)
+            out.append(_BINARY_OP_CODES[value["op"]])
+            _write_varint(out, len(value["args"]))
+            for x in value["args"]:
+                _binary_encode(out, x, field_codes)
+        else:
+            out.append(_B_DICT)
+            _write_varint(out, len(value))
+            for k, v in value.items():
+                _binary_encode(out, k, field_codes)
+                _binary_encode(out, v, field_codes)
+    elif isinstance(value, (list, tuple)):
+        size = _position_size(value)
+        joined = None
+        if size == 0 and len(value) > 1 and all(type(x) is str for x in value):
+            joined = "\x00".join(value)
+            if joined.count("\x00") != len(value) - 1:
+                joined = None
+        if joined is not None:
+            encoded = joined.encode("utf-8")
+            out.append(_B_STRINGS)
+            _write_varint(out, len(encoded))
+            out += encoded
+        elif size > 0:
+            packed = array("d", chain.from_iterable(value))
+            if sys.byteorder == "big":
+                packed.byteswap()
+            out.append(_B_POSITIONS)
+            out.append(size)
+            _write_varint(out, len(value))
+            out += packed.tobytes()
+        else:
+            out.append(_B_LIST)
+            _write_varint(out, len(value))
+            for x in value:
+                _binary_encode(out, x, field_codes)
+    else:
+        raise ValueError(f"can't encode {type(value).__name__} value {value!r}")
+
+
+class _BinaryReader:
+    __slots__ = ("_data", "_pos", "_field_names")
+
+    def __init__(self, data: bytes, pos: int, field_names: tuple):
+        self._data = data
+        self._pos = pos
+        self._field_names = field_names
+
+    def _varint(self) -> int:
+        value = shift = 0
+        data = self._data
+        while True:
+            byte = data[self._pos]
+            self._pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        return value >> 1 if value & 1 == 0 else -(value >> 1) - 1
+
+    def read(self):
+        tag = self._data[self._pos]
+        self._pos += 1
+        if tag == _B_NONE:
+            return None
+        if tag == _B_FALSE or tag == _B_TRUE:
+            return tag == _B_TRUE
+        if tag == _B_INT:
+            return self._varint()
+        if tag == _B_FLOAT:
+            self._pos += 8
+            return _B_DOUBLE.unpack_from(self._data, self._pos - 8)[0]
+        if tag == _B_STR:
+            size = self._varint()
+            self._pos += size
+            return self._data[self._pos - size:self._pos].decode("utf-8")
+        if tag == _B_DATETIME:
+            microseconds = self._varint()
+            offset = self._varint()
+            value = _EPOCH + timedelta(microseconds=microseconds)
+            return value if offset == 0 else value.astimezone(timezone(timedelta(seconds=offset)))
+        if tag == _B_NAIVE_DATETIME:
+            return _NAIVE_EPOCH + timedelta(microseconds=self._varint())
+        if tag == _B_DATE:
+            return date.fromordinal(self._varint())
+        if tag == _B_LIST:
+            return [self.read() for _ in range(self._varint())]
+        if tag == _B_DICT:
+            return {self.read(): self.read() for _ in range(self._varint())}
+        if tag == _B_FIELD:
+            return {"property": self._field_names[self._varint()]}
+        if tag == _B_OP:
+            op = _BINARY_OPS[self._data[self._pos]]
+            self._pos += 1
+            return {"op": op, "args": [self.read() for _ in range(self._varint())]}
+        if tag == _B_STRINGS:
+            size = self._varint()
+            self._pos += size
+            return self._data[self._pos - size:self._pos].decode("utf-8").split("\x00")
+        if tag == _B_POSITIONS:
+            size = self._data[self._pos]
+            self._pos += 1
+            count = self._varint()
+            packed = array("d")
+            packed.frombytes(self._data[self._pos:self._pos + count * size * 8])
+            self._pos += count * size * 8
+            if sys.byteorder == "big":
+                packed.byteswap()
+            values = iter(packed)
+            return [list(x) for x in zip(*[values] * size)]
+        raise ValueError(f"unknown tag {tag} at byte {self._pos - 1}")
+
+
+def _orjson_default(obj):
+    # match _DateTimeEncoder, which encodes unsupported types as null
+    return None
+
+
+class CompressedBody(NamedTuple):
+    """
+    compressed POST body and the headers to send with it, e.g.
+    `requests.post(url, data=compressed.body, headers=compressed.headers)`
+    """
+    body: bytes
+    headers: dict[str, str]
+
+
+class _JSONBackend(NamedTuple):
+    """
+    compact JSON encoder used by query_dump_json and query_dump_bytes. `dumps` takes a
+    json-compatible object and returns a str with no whitespace between tokens, `dumps_bytes`
+    returns the same JSON as UTF-8 bytes.
+    """
+    name: str
+    dumps: Callable[[Any], str]
+    dumps_bytes: Callable[[Any], bytes]
+
+
+_stdlib_encode = _DateTimeEncoder(separators=(",", ":")).encode
+_JSON_BACKENDS = {
+    "stdlib": _JSONBackend("stdlib", _stdlib_encode, lambda obj: _stdlib_encode(obj).encode()),
+}
+if orjson is not None:
+    _JSON_BACKENDS["orjson"] = _JSONBackend("orjson",
+                                            lambda obj: orjson.dumps(obj, default=_orjson_default).decode(),
+                                            lambda obj: orjson.dumps(obj, default=_orjson_default))
+_json_backend = _JSON_BACKENDS["orjson" if orjson is not None else "stdlib"]
+
+
+def _is_binary_stream(fp) -> bool:
+    # text streams are io.TextIOBase or have a mode without "b". anything else takes bytes, e.g. a
+    # BytesIO, a SpooledTemporaryFile(mode="w+b"), a gzip.GzipFile or a socket.makefile("wb")
+    if isinstance(fp, io.TextIOBase):
+        return False
+    mode = getattr(fp, "mode", None)
+    return not isinstance(mode, str) or "b" in mode
+
+
+def _write_json(write: Callable[[str], Any], obj, dumps: Callable[[Any], str], chunk_size: int):
+    # stream obj as compact JSON. lists longer than chunk_size (coordinate rings, in_set values)
+    # are encoded chunk_size elements at a time, so no more than one chunk is held as a string
+    if isinstance(obj, dict):
+        write("{")
+        for i, (key, value) in enumerate(obj.items()):
+            if i > 0:
+                write(",")
+            write(dumps(key))
+            write(":")
+            _write_json(write, value, dumps, chunk_size)
+        write("}")
+    elif isinstance(obj, (list, tuple)) and len(obj) > chunk_size:
+        write("[")
+        for start in range(0, len(obj), chunk_size):
+            if start > 0:
+                write(",")
+            write(dumps(obj[start:start + chunk_size])[1:-1])
+        write("]")
+    elif isinstance(obj, (list, tuple)) and any(isinstance(x, (list, tuple, dict)) for x in obj):
+        write("[")
+        for i, item in enumerate(obj):
+            if i > 0:
+                write(",")
+            _write_json(write, item, dumps, chunk_size)
+        write("]")
+    else:
+        write(dumps(obj))
+
+
+def set_json_backend(name: str) -> str:
+    """
+    choose the encoder used by `QueryBuilder.query_dump_json`. "orjson" is the default when the
+    orjson package is importable, otherwise "stdlib". both produce equivalent compact JSON, though
+    orjson writes non-ASCII characters unescaped and uses shorter float exponents.
+
+    Args:
+        name (str): "orjson" or "stdlib"
+
+    Returns:
+        str: name of the previously selected backend
+    """
+    global _json_backend
+    if name not in _JSON_BACKENDS:
+        raise ValueError(f"json backend {name} is not available. choose from {sorted(_JSON_BACKENDS)}")
+    previous = _json_backend.name
+    _json_backend = _JSON_BACKENDS[name]
+    return previous
+
+
+def _truncated(text: str, max_chars: Optional[int]) -> str:
+    if max_chars is None or len(text) <= max_chars:
+        return text
+    return text[:max(max_chars - 3, 0)] + "..."
+
+
+def _geometry_positions(coordinates) -> list:
+    # flatten nested GeoJSON coordinates one level at a time down to a list of positions. empty
+    # parts, e.g. an empty ring that trusted mode let through, are dropped at each level
+    if len(coordinates) > 0 and isinstance(coordinates[0], (int, float)):
+        return [coordinates]
+    while True:
+        coordinates = [x for x in coordinates if len(x) > 0]
+        if len(coordinates) == 0 or isinstance(coordinates[0][0], (int, float)):
+            return coordinates
+        coordinates = [x for part in coordinates for x in part]
+
+
+def _query_summary_geometry(geometry: dict) -> str:
+    # type, vertex count and bbox, without rendering the coordinates
+    if "geometries" in geometry:
+        positions = [p for x in geometry["geometries"] for p in _geometry_positions(x.get("coordinates", []))]
+    else:
+        positions = _geometry_positions(geometry["coordinates"])
+    if len(positions) == 0:
+        return f"{geometry['type']}(0 vertices)"
+    xs = [p[0] for p in positions]
+    ys = [p[1] for p in positions]
+    bbox = [min(xs), min(ys), max(xs), max(ys)]
+    vertices = "1 vertex" if len(positions) == 1 else f"{len(positions):,} vertices"
+    return f"{geometry['type']}({vertices}, bbox [{', '.join(f'{x:g}' for x in bbox)}])"
+
+
+def _query_summary_list(values: list, max_chars: int) -> str:
+    # render items until the budget is spent, e.g. ["a", "b", ... 9,998 more]
+    rendered = []
+    length = 2
+    for x in values:
+        item = _query_summary_value(x, max_chars)
+        if length + len(item) > max_chars:
+            break
+        rendered.append(item)
+        length += len(item) + 2
+    if len(rendered) < len(values):
+        while rendered and length + len(f"... {len(values) - len(rendered):,} more") > max_chars:
+            length -= len(rendered.pop()) + 2
+        rendered.append(f"... {len(values) - len(rendered):,} more")
+    return "[" + ", ".join(rendered) + "]"
+
+
+def _query_summary_value(value, max_chars: Optional[int] = None):
     if isinstance(value, dict):
         if set(value) == {"property"}:
             return value["property"]
-        return json.dumps(value, sort_keys=True, cls=_DateTimeEncoder)
+        if max_chars is None:
+            return json.dumps(value, sort_keys=True, cls=_DateTimeEncoder)
+        if "type" in value and ("coordinates" in value or "geometries" in value):
+            return _query_summary_geometry(value)
+        # stop encoding once the budget is spent
+        chunks = []
+        length = 0
+        for chunk in _DateTimeEncoder(sort_keys=True).iterencode(value):
+            chunks.append(chunk)
+            length += len(chunk)
+            if length > max_chars:
+                break
+        return _truncated("".join(chunks), max_chars)
     if isinstance(value, list):
+        if max_chars is not None:
+            return _query_summary_list(value, max_chars)
         return "[" + ", ".join(_query_summary_value(x) for x in value) + "]"
     if isinstance(value, (date, datetime)):
         return value.isoformat()
     if isinstance(value, str):
+        if max_chars is not None:
+            return _truncated(json.dumps(value[:max_chars]), max_chars)
         return json.dumps(value)
     if isinstance(value, bool) or value is None:
         return json.dumps(value)
@@ -52,16 +734,33 @@ def _query_summary_value(value):
     return json.dumps(str(value))
 
 
-def _query_summary_filter(query_filter, multiline=True, nested=False):
+def _query_summary_filter(query_filter, multiline=True, nested=False,
+                          max_value_chars: Optional[int] = None, max_chars: Optional[int] = None):
     op = query_filter["op"]
     args = query_filter.get("args", [])
 
+    def value(x):
+        return _query_summary_value(x, max_value_chars)
+
     if op in ("and", "or"):
         separator = f"\n{op.upper()} " if multiline else f" {op.upper()} "
-        expression = separator.join(
-            _query_summary_filter(arg, multiline=multiline, nested=True)
-            for arg in args
-        )
+        parts = []
+        length = 0
+        for arg in args:
+            # predicates past the total budget are counted, not rendered
+            if max_chars is not None and length > max_chars:
+                break
+            part = _query_summary_filter(arg, multiline=multiline, nested=True, max_value_chars=max_value_chars,
+                                         max_chars=None if max_chars is None else max_chars - length)
+            parts.append(part)
+            length += len(part) + len(separator)
+        if max_chars is not None and length - len(separator) > max_chars:
+            # drop whole predicates until the count of the rest fits
+            while parts and length + len(f"... {len(args) - len(parts):,} more") > max_chars:
+                length -= len(parts.pop()) + len(separator)
+        if len(parts) < len(args):
+            parts.append(f"... {len(args) - len(parts):,} more")
+        expression = separator.join(parts)
         if nested and len(args) > 1:
             return f"({expression})"
         return expression
@@ -69,20 +768,21 @@ def _query_summary_filter(query_filter, multiline=True, nested=False):
     if op == "not":
         if len(args) == 1 and args[0].get("op") == "in" and len(args[0].get("args", [])) == 2:
             not_args = args[0]["args"]
-            return f"{_query_summary_value(not_args[0])} NOT IN {_query_summary_value(not_args[1])}"
-        expression = _query_summary_filter(args[0], multiline=multiline, nested=True)
+            return f"{value(not_args[0])} NOT IN {value(not_args[1])}"
+        expression = _query_summary_filter(args[0], multiline=multiline, nested=True,
+                                           max_value_chars=max_value_chars, max_chars=max_chars)
         return f"NOT {expression}"
 
     if op == "isNull":
-        return f"{_query_summary_value(args[0])} IS NULL"
+        return f"{value(args[0])} IS NULL"
 
     if op in ("s_intersects",):
-        return f"{op}(" + ", ".join(_query_summary_value(arg) for arg in args) + ")"
+        return f"{op}(" + ", ".join(value(arg) for arg in args) + ")"
 
     if len(args) == 2:
-        return f"{_query_summary_value(args[0])} {op.upper()} {_query_summary_value(args[1])}"
+        return f"{value(args[0])} {op.upper()} {value(args[1])}"
 
-    return f"{op}(" + ", ".join(_query_summary_value(arg) for arg in args) + ")"
+    return f"{op}(" + ", ".join(value(arg) for arg in args) + ")"
 
 
 class _QueryTuple:
@@ -130,7 +830,7 @@ class _QueryTuple:
     def _recurse_build_query(query_tuple: _QueryTuple, filter_query: dict):
         if isinstance(query_tuple.left, _QueryBase):
             filter_query["args"].append({"op": query_tuple.op,
-                                         "args": [query_tuple.left.property_obj, query_tuple.right]})
+                                         "args": [query_tuple.left._shared_property_obj, query_tuple.right]})
         elif isinstance(query_tuple.left, _FilterTuple):
             filter_query["args"].append(query_tuple.left._build_query())
             _QueryTuple._recurse_build_query(query_tuple.right, filter_query)
@@ -149,27 +849,96 @@ class _QueryTuple:
             filter_query["op"] = "or"
         return filter_query
 
+    def _build_json_query(self):
+        return _isoformat_values(self._build_query())
+
 
 class _FilterTuple(_QueryTuple):
     pass
 
 
+class _FieldState(NamedTuple):
+    """
+    immutable predicate state for a single field.
+
+    setters replace the record rather than mutating it. records live in the QueryBuilder's
+    `_field_state` map keyed by field name, so untouched fields have no entry at all and a
+    forked builder can share the map with its parent until one of them writes.
+    """
+    eq_value: Any = None
+    ne_value: Any = None
+    gt_value: Any = None
+    gt_operand: Optional[str] = None
+    lt_value: Any = None
+    lt_operand: Optional[str] = None
+    in_values: Optional[list] = None
+    not_in_values: Optional[list] = None
+    like_value: Any = None
+    geometry: Optional[dict] = None
+    is_null: Optional[bool] = None
+
+
+_EMPTY_STATE = _FieldState()
+
+_RANGE_OPERANDS = MappingProxyType({"gt": ">", "gte": ">=", "lt": "<", "lte": "<="})
+
+# field query methods that QueryBuilder.apply accepts as operations
+_APPLY_OPERATIONS = frozenset(["equals", "not_equals", "gt", "gte", "lt", "lte",
+                               "in_set", "not_in_set", "like", "is_null", "intersects"])
+
+
+class _FieldMetadata(NamedTuple):
+    """
+    immutable description of a queryable field.
+
+    each extension (and QueryBuilder itself) builds a `_field_registry` of these once at import
+    time, and every field query object references its entry rather than copying the limits.
+    """
+    field_name: str
+    field_type: str
+    min_value: Optional[Union[int, float]] = None
+    max_value: Optional[Union[int, float]] = None
+    is_int: bool = False
+    enum_values: frozenset[str] = frozenset()
+    enum_type: Optional[type[Enum]] = None
+
+
+def _enum_metadata(field_name: str, enum_type: type[Enum]) -> _FieldMetadata:
+    return _FieldMetadata(field_name, "enum", enum_values=frozenset(x.value for x in enum_type), enum_type=enum_type)
+
+
 class _QueryBase:
-    def __init__(self, field_name, parent_obj: QueryBuilder):
-        self._field_name = field_name
+    __slots__ = ("_meta", "_parent_obj")
+
+    def __init__(self, metadata: _FieldMetadata, parent_obj: QueryBuilder):
+        self._meta = metadata
         self._parent_obj = parent_obj
 
+    @property
+    def _field_name(self):
+        return self._meta.field_name
+
+    @property
+    def _state(self) -> _FieldState:
+        return self._parent_obj._field_state.get(self._meta.field_name, _EMPTY_STATE)
+
+    @_state.setter
+    def _state(self, state: _FieldState):
+        self._parent_obj._set_field_state(self._meta.field_name, state)
+
     def sort_by_asc(self):
-        self._parent_obj._sort_by_field = self._field_name
-        self._parent_obj._sort_by_direction = "asc"
+        self._parent_obj._set_sort_by(self._field_name, "asc")
 
     def sort_by_desc(self):
-        self._parent_obj._sort_by_field = self._field_name
-        self._parent_obj._sort_by_direction = "desc"
+        self._parent_obj._set_sort_by(self._field_name, "desc")
 
     def _build_query(self):
         pass
 
+    def _build_json_query(self):
+        # the predicate with only json-native values, for the query_dump_json encoders
+        return self._build_query()
+
     def __eq__(self, other):
         # TODO, check for None and implement an is null
         return _QueryTuple(self, "=", other)
@@ -196,7 +965,12 @@ class _QueryBase:
 
     @property
     def property_obj(self):
-        return {"property": self._field_name}
+        return {"property": self._meta.field_name}
+
+    @property
+    def _shared_property_obj(self):
+        # shared and read-only, see _PropertyNode
+        return _property_node(self._meta.field_name)
 
     def _greater_check(self, value):
         pass
@@ -208,16 +982,20 @@ class _QueryBase:
         pass
 
     def _clear_values(self):
-        pass
+        self._state = _EMPTY_STATE
 
+    def _next_state(self, state: _FieldState, operation: str, value) -> _FieldState:
+        """
+        validate a setter's input and return the field's state after it, without writing it.
+        setters write the result, and QueryBuilder.apply folds a whole spec before writing any.
+        """
+        if operation == "is_null":
+            return _FieldState(is_null=True)
+        raise ValueError(f"unsupported operation {operation}")
 
-class _BooleanQuery(_QueryBase):
-    _eq_value = None
-    _is_null = None
 
-    def _clear_values(self):
-        self._is_null = None
-        self._eq_value = None
+class _BooleanQuery(_QueryBase):
+    __slots__ = ()
 
     def equals(self, value: bool) -> QueryBuilder:
         """
@@ -229,8 +1007,7 @@ class _BooleanQuery(_QueryBase):
         Returns:
             QueryBuilder: query builder for additional queries to add
         """
-        self._clear_values()
-        self._eq_value = value
+        self._state = self._next_state(self._state, "equals", value)
         return self._parent_obj
 
     def is_null(self) -> QueryBuilder:
@@ -240,26 +1017,31 @@ class _BooleanQuery(_QueryBase):
         Returns:
             QueryBuilder: query builder for additional queries to add
         """
-        self._clear_values()
-        self._is_null = True
+        self._state = self._next_state(self._state, "is_null", None)
         return self._parent_obj
 
+    def _next_state(self, state: _FieldState, operation: str, value) -> _FieldState:
+        if operation == "equals":
+            return _FieldState(eq_value=value)
+        return super()._next_state(state, operation, value)
+
     def _build_query(self):
-        if self._eq_value is not None:
+        state = self._state
+        if state.eq_value is not None:
             return {
                 "op": "=",
-                "args": [self.property_obj, self._eq_value]
+                "args": [self._shared_property_obj, state.eq_value]
             }
-        elif self._is_null is not None and self._is_null is True:
+        elif state.is_null is not None and state.is_null is True:
             return {
                 "op": "isNull",
-                "args": [self.property_obj]
+                "args": [self._shared_property_obj]
             }
         return None
 
 
 class _NullCheck(_QueryBase):
-    _is_null = None
+    __slots__ = ()
 
     def is_null(self) -> QueryBuilder:
         """
@@ -268,34 +1050,32 @@ class _NullCheck(_QueryBase):
         Returns:
             QueryBuilder: query builder for additional queries to add
         """
-        self._clear_values()
-        self._is_null = True
+        self._state = self._next_state(self._state, "is_null", None)
         return self._parent_obj
 
     def _build_query(self):
-        if self._is_null is not None and self._is_null is True:
+        if self._state.is_null is True:
             return {
                 "op": "isNull",
-                "args": [self.property_obj]
+                "args": [self._shared_property_obj]
             }
         return None
 
 
 class _BaseString(_QueryBase):
-    _eq_value = None
-    _ne_value = None
-    _in_values = None
-    _not_in_values = None
-    _like_value = None
-    _is_null = None
+    __slots__ = ()
 
-    def _clear_values(self):
-        self._is_null = None
-        self._eq_value = None
-        self._ne_value = None
-        self._in_values = None
-        self._not_in_values = None
-        self._like_value = None
+    def _adjust_enum(self, value):
+        if self._parent_obj._trusted:
+            return value
+        if isinstance(value, Enum):
+            return value.value
+        return str(value)
+
+    def _adjust_enums(self, values):
+        if self._parent_obj._trusted:
+            return list(values)
+        return [self._adjust_enum(x) for x in values]
 
     def is_null(self) -> QueryBuilder:
         """
@@ -304,76 +1084,154 @@ class _BaseString(_QueryBase):
         Returns:
             QueryBuilder: query builder for additional queries to add
         """
-        self._clear_values()
-        self._is_null = True
+        self._state = self._next_state(self._state, "is_null", None)
         return self._parent_obj
 
     def _build_query(self):
-        if self._eq_value is not None:
+        state = self._state
+        if state.eq_value is not None:
             return {
                 "op": "=",
-                "args": [self.property_obj, self._eq_value]
+                "args": [self._shared_property_obj, state.eq_value]
             }
-        elif self._ne_value is not None:
+        elif state.ne_value is not None:
             return {
                 "op": "!=",
-                "args": [self.property_obj, self._ne_value]
+                "args": [self._shared_property_obj, state.ne_value]
             }
-        elif self._in_values is not None and len(self._in_values) > 0:
+        elif state.in_values is not None and len(state.in_values) > 0:
             return {
                 "op": "in",
                 "args": [
-                    self.property_obj,
-                    self._in_values
+                    self._shared_property_obj,
+                    state.in_values
                 ]
             }
-        elif self._not_in_values is not None and len(self._not_in_values) > 0:
+        elif state.not_in_values is not None and len(state.not_in_values) > 0:
             return {
                 "op": "not",
                 "args": [
                     {
                         "op": "in",
                         "args": [
-                            self.property_obj,
-                            self._not_in_values
+                            self._shared_property_obj,
+                            state.not_in_values
                         ]
                     }
                 ]
             }
-        elif self._like_value is not None:
+        elif state.like_value is not None:
             return {
                 "op": "like",
                 "args": [
-                    self.property_obj,
-                    self._like_value
+                    self._shared_property_obj,
+                    state.like_value
                 ]
             }
-        elif self._is_null is not None and self._is_null is True:
+        elif state.is_null is not None and state.is_null is True:
             return {
                 "op": "isNull",
-                "args": [self.property_obj]
+                "args": [self._shared_property_obj]
             }
         return None
 
 
 class _EnumQuery(_BaseString):
-    _enum_values: set[str] = set()
+    __slots__ = ()
 
     @classmethod
     def init_enums(cls, field_name, parent_obj: QueryBuilder, enum_fields: list[str]):
-        c = _EnumQuery(field_name, parent_obj)
-        c._enum_values = set(enum_fields)
-        if len(c._enum_values) <= 1:
+        enum_values = frozenset(enum_fields)
+        if len(enum_values) <= 1:
             raise ValueError(f"enum_fields must have 2 or more unique values. fields are {enum_fields}")
-        return c
+        return cls(_FieldMetadata(field_name, "enum", enum_values=enum_values), parent_obj)
+
+    def equals(self, value: Enum) -> QueryBuilder:
+        """
+        for the field, query for all items where it's enum value equals this input
+
+        Args:
+            value (Enum): equality check for the field. a member of the field's Enum or its value.
+
+        Returns:
+            QueryBuilder: query builder for additional queries to add
+        """
+        self._state = self._next_state(self._state, "equals", value)
+        return self._parent_obj
+
+    def not_equals(self, value: Enum) -> QueryBuilder:
+        """
+        for the field, query for all items where it's enum value does not equal this input
+
+        Args:
+            value (Enum): non-equality check for the field. a member of the field's Enum or its value.
+
+        Returns:
+            QueryBuilder: query builder for additional queries to add
+        """
+        self._state = self._next_state(self._state, "not_equals", value)
+        return self._parent_obj
+
+    def in_set(self, values: list[Enum]) -> QueryBuilder:
+        """
+        for the values input, create an in_set query for this field
+
+        Args:
+            values (list[Enum]): members of the field's Enum or their values.
+
+        Returns:
+            QueryBuilder: query builder for additional queries to add
+        """
+        self._state = self._next_state(self._state, "in_set", values)
+        return self._parent_obj
+
+    def not_in_set(self, values: list[Enum]) -> QueryBuilder:
+        """
+        for the values input, create an not_in_set query for this field
+
+        Args:
+            values (list[Enum]): members of the field's Enum or their values.
+
+        Returns:
+            QueryBuilder: query builder for additional queries to add
+        """
+        self._state = self._next_state(self._state, "not_in_set", values)
+        return self._parent_obj
+
+    def __getattr__(self, name: str):
+        # only reached when normal lookup fails, so this resolves member shortcuts like `.left()`
+        enum_type = None if name.startswith("_") else self._meta.enum_type
+        if _ENUM_MEMBER_SHORTCUTS and enum_type is not None and name in enum_type.__members__:
+            member = enum_type[name]
+            return lambda: self.equals(member)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __dir__(self):
+        members = list(self._meta.enum_type.__members__) if _ENUM_MEMBER_SHORTCUTS and self._meta.enum_type else []
+        return sorted(set(super().__dir__()) | set(members))
+
+    def _next_state(self, state: _FieldState, operation: str, value) -> _FieldState:
+        if operation in ("equals", "not_equals"):
+            value = self._adjust_enum(value)
+            self._check([value])
+            return _FieldState(eq_value=value) if operation == "equals" else _FieldState(ne_value=value)
+        if operation in ("in_set", "not_in_set"):
+            values = self._adjust_enums(value)
+            self._check(values)
+            return _FieldState(in_values=values) if operation == "in_set" else _FieldState(not_in_values=values)
+        return super()._next_state(state, operation, value)
 
     def _check(self, values: list[str]):
-        self._clear_values()
-        if not set(values).issubset(self._enum_values):
-            raise ValueError("")
+        if self._parent_obj._trusted:
+            return
+        if not self._meta.enum_values.issuperset(values):
+            invalid = sorted(set(values) - self._meta.enum_values)
+            raise ValueError(f"{invalid} not valid values for {self._meta.field_name}")
 
 
 class _StringQuery(_BaseString):
+    __slots__ = ()
+
     def equals(self, value: str) -> QueryBuilder:
         """
         for the field, query for all items where it's string value equals this input
@@ -384,8 +1242,7 @@ class _StringQuery(_BaseString):
         Returns:
             QueryBuilder: query builder for additional queries to add
         """
-        self._clear_values()
-        self._eq_value = self._adjust_enum(value)
+        self._state = self._next_state(self._state, "equals", value)
         return self._parent_obj
 
     def not_equals(self, value: str) -> QueryBuilder:
@@ -398,8 +1255,7 @@ class _StringQuery(_BaseString):
         Returns:
             QueryBuilder: query builder for additional queries to add
         """
-        self._clear_values()
-        self._ne_value = self._adjust_enum(value)
+        self._state = self._next_state(self._state, "not_equals", value)
         return self._parent_obj
 
     def in_set(self, values: list[str]) -> QueryBuilder:
@@ -412,8 +1268,7 @@ class _StringQuery(_BaseString):
         Returns:
             QueryBuilder: query builder for additional queries to add
         """
-        self._clear_values()
-        self._in_values = [self._adjust_enum(x) for x in values]
+        self._state = self._next_state(self._state, "in_set", values)
         return self._parent_obj
 
     def not_in_set(self, values: list[str]) -> QueryBuilder:
@@ -426,8 +1281,7 @@ class _StringQuery(_BaseString):
         Returns:
             QueryBuilder: query builder for additional queries to add
         """
-        self._clear_values()
-        self._not_in_values = [self._adjust_enum(x) for x in values]
+        self._state = self._next_state(self._state, "not_in_set", values)
         return self._parent_obj
 
     def like(self, value: str) -> QueryBuilder:
@@ -440,110 +1294,84 @@ class _StringQuery(_BaseString):
         Returns:
             QueryBuilder: query builder for additional queries to add
         """
-        self._clear_values()
-        self._like_value = self._adjust_enum(value)
+        self._state = self._next_state(self._state, "like", value)
         return self._parent_obj
 
-    def _clear_values(self):
-        self._in_values = None
-        self._not_in_values = None
-        self._eq_value = None
-        self._ne_value = None
-        self._like_value = None
-
-    @staticmethod
-    def _adjust_enum(value):
-        if isinstance(value, Enum):
-            return value.value
-        return str(value)
+    def _next_state(self, state: _FieldState, operation: str, value) -> _FieldState:
+        if operation == "equals":
+            return _FieldState(eq_value=self._adjust_enum(value))
+        if operation == "not_equals":
+            return _FieldState(ne_value=self._adjust_enum(value))
+        if operation == "like":
+            return _FieldState(like_value=self._adjust_enum(value))
+        if operation == "in_set":
+            return _FieldState(in_values=self._adjust_enums(value))
+        if operation == "not_in_set":
+            return _FieldState(not_in_values=self._adjust_enums(value))
+        return super()._next_state(state, operation, value)
 
 
 class _Query(_QueryBase):
-    _gt_value = None
-    _gt_operand = None
-    _lt_value = None
-    _lt_operand = None
-    _eq_value = None
-    _ne_value = None
-    _is_null = None
+    __slots__ = ()
 
     def _build_query(self):
-        if self._eq_value is not None:
+        state = self._state
+        if state.eq_value is not None:
             return {
                 "op": "=",
-                "args": [self.property_obj, self._eq_value]
+                "args": [self._shared_property_obj, state.eq_value]
             }
-        elif self._is_null is not None and self._is_null is True:
+        elif state.is_null is not None and state.is_null is True:
             return {
                 "op": "isNull",
-                "args": [self.property_obj]
+                "args": [self._shared_property_obj]
             }
-        elif self._gt_value is None and self._lt_value is None:
-            if self._ne_value is None:
-                return None
-            return {
+
+        # build only the nodes that are emitted
+        ne_query = None
+        if state.ne_value is not None:
+            ne_query = {
                 "op": "!=",
-                "args": [self.property_obj, self._ne_value]
+                "args": [self._shared_property_obj, state.ne_value]
             }
+        if state.gt_value is None and state.lt_value is None:
+            return ne_query
+        if state.gt_value is not None and state.lt_value is not None and state.gt_value == state.lt_value:
+            return None
 
-        gt_query = {
-            "op": self._gt_operand,
-            "args": [self.property_obj, self._gt_value]
-        }
-        lt_query = {
-            "op": self._lt_operand,
-            "args": [self.property_obj, self._lt_value]
-        }
-        ne_query = {
-            "op": "!=",
-            "args": [self.property_obj, self._ne_value]
-        }
-        range_query = None
-        if self._gt_value is not None and self._lt_value is None:
-            if self._ne_value is None:
-                return gt_query
+        args = []
+        if state.gt_value is not None:
+            args.append({
+                "op": state.gt_operand,
+                "args": [self._shared_property_obj, state.gt_value]
+            })
+        if state.lt_value is not None:
+            args.append({
+                "op": state.lt_operand,
+                "args": [self._shared_property_obj, state.lt_value]
+            })
+        if len(args) == 2 and state.gt_value > state.lt_value:
+            # a range that wraps around, e.g. gt(300) and lt(60)
             range_query = {
-                "op": "and",
-                "args": [
-                    gt_query
-                ]
-            }
-        elif self._lt_value is not None and self._gt_value is None:
-            if self._ne_value is None:
-                return lt_query
-            range_query = {
-                "op": "and",
-                "args": [
-                    lt_query
-                ]
+                "op": "or",
+                "args": args
             }
-        elif self._gt_value is not None and self._lt_value is not None and self._gt_value < self._lt_value:
-            range_query = {
+            if ne_query is None:
+                return range_query
+            return {
                 "op": "and",
                 "args": [
-                    gt_query, lt_query
+                    range_query, ne_query
                 ]
             }
-        if range_query is not None:
-            if self._ne_value is not None:
-                range_query["args"].append(ne_query)
-            return range_query
-
-        if self._gt_value is not None and self._lt_value is not None and self._gt_value > self._lt_value:
-            range_query = {
-                "op": "or",
-                "args": [
-                    gt_query, lt_query
-                ]
-            }
-            if self._ne_value is not None:
-                range_query = {
-                    "op": "and",
-                    "args": [
-                        range_query, ne_query
-                    ]
-                }
-        return range_query
+        if ne_query is not None:
+            args.append(ne_query)
+        if len(args) == 1:
+            return args[0]
+        return {
+            "op": "and",
+            "args": args
+        }
 
     def equals(self, value) -> QueryBuilder:
         """
@@ -555,9 +1383,7 @@ class _Query(_QueryBase):
         Returns:
             QueryBuilder: query builder for additional queries to add
         """
-        self._check(value)
-        self._clear_values()
-        self._eq_value = value
+        self._state = self._next_state(self._state, "equals", value)
         return self._parent_obj
 
     def not_equals(self, value) -> QueryBuilder:
@@ -570,10 +1396,7 @@ class _Query(_QueryBase):
         Returns:
             QueryBuilder: query builder for additional queries to add
         """
-        self._check(value)
-        self._eq_value = None
-        self._is_null = None
-        self._ne_value = value
+        self._state = self._next_state(self._state, "not_equals", value)
         return self._parent_obj
 
     def gt(self, value) -> QueryBuilder:
@@ -586,12 +1409,7 @@ class _Query(_QueryBase):
         Returns:
             QueryBuilder: query builder for additional queries to add
         """
-        self._check(value)
-        self._greater_check(value)
-        self._eq_value = None
-        self._is_null = None
-        self._gt_value = value
-        self._gt_operand = ">"
+        self._state = self._next_state(self._state, "gt", value)
         return self._parent_obj
 
     def gte(self, value) -> QueryBuilder:
@@ -604,12 +1422,7 @@ class _Query(_QueryBase):
         Returns:
             QueryBuilder: query builder for additional queries to add
         """
-        self._check(value)
-        self._greater_check(value)
-        self._eq_value = None
-        self._is_null = None
-        self._gt_value = value
-        self._gt_operand = ">="
+        self._state = self._next_state(self._state, "gte", value)
         return self._parent_obj
 
     def lt(self, value) -> QueryBuilder:
@@ -622,12 +1435,7 @@ class _Query(_QueryBase):
         Returns:
             QueryBuilder: query builder for additional queries to add
         """
-        self._check(value)
-        self._less_check(value)
-        self._eq_value = None
-        self._is_null = None
-        self._lt_value = value
-        self._lt_operand = "<"
+        self._state = self._next_state(self._state, "lt", value)
         return self._parent_obj
 
     def lte(self, value) -> QueryBuilder:
@@ -640,12 +1448,7 @@ class _Query(_QueryBase):
         Returns:
             QueryBuilder: query builder for additional queries to add
         """
-        self._check(value)
-        self._less_check(value)
-        self._eq_value = None
-        self._is_null = None
-        self._lt_value = value
-        self._lt_operand = "<="
+        self._state = self._next_state(self._state, "lte", value)
         return self._parent_obj
 
     def is_null(self) -> QueryBuilder:
@@ -655,21 +1458,29 @@ class _Query(_QueryBase):
         Returns:
             QueryBuilder: query builder for additional queries to add
         """
-        self._clear_values()
-        self._is_null = True
+        self._state = self._next_state(self._state, "is_null", None)
         return self._parent_obj
 
-    def _clear_values(self):
-        self._gt_value = None
-        self._gt_operand = None
-        self._lt_value = None
-        self._lt_operand = None
-        self._eq_value = None
-        self._ne_value = None
-        self._is_null = None
+    def _next_state(self, state: _FieldState, operation: str, value) -> _FieldState:
+        if operation == "is_null":
+            return super()._next_state(state, operation, value)
+        self._check(value)
+        if operation == "equals":
+            return _FieldState(eq_value=value)
+        if operation == "not_equals":
+            return state._replace(eq_value=None, is_null=None, ne_value=value)
+        if operation in ("gt", "gte"):
+            self._greater_check(value)
+            return state._replace(eq_value=None, is_null=None, gt_value=value, gt_operand=_RANGE_OPERANDS[operation])
+        if operation in ("lt", "lte"):
+            self._less_check(value)
+            return state._replace(eq_value=None, is_null=None, lt_value=value, lt_operand=_RANGE_OPERANDS[operation])
+        return super()._next_state(state, operation, value)
 
 
 class _DateQuery(_Query):
+    __slots__ = ()
+
     def equals(self, value: date, tzinfo=timezone.utc) -> QueryBuilder:
         """
         for the field, query for all items where it's date equals this input
@@ -680,19 +1491,7 @@ class _DateQuery(_Query):
         Returns:
             QueryBuilder: query builder for additional queries to add
         """
-        self._check(value)
-        if isinstance(value, datetime):
-            self._eq_value = value
-        elif isinstance(value, date):
-            start = datetime.combine(value, datetime.min.time(), tzinfo=tzinfo)
-            end = datetime.combine(value, datetime.max.time(), tzinfo=tzinfo)
-            self._gt_value = start
-            self._gt_operand = ">="
-            self._lt_value = end
-            self._lt_operand = "<="
-        else:
-            self._eq_value = value
-
+        self._state = self._date_state(self._state, "equals", value, tzinfo)
         return self._parent_obj
 
     def not_equals(self, value: date, tzinfo=timezone.utc) -> QueryBuilder:
@@ -705,19 +1504,7 @@ class _DateQuery(_Query):
         Returns:
             QueryBuilder: query builder for additional queries to add
         """
-        self._check(value)
-        if isinstance(value, datetime):
-            self._ne_value = value
-        elif isinstance(value, date):
-            start = datetime.combine(value, datetime.min.time(), tzinfo=tzinfo)
-            end = datetime.combine(value, datetime.max.time(), tzinfo=tzinfo)
-            self._gt_value = end
-            self._gt_operand = ">="
-            self._lt_value = start
-            self._lt_operand = "<="
-        else:
-            self._ne_value = value
-
+        self._state = self._date_state(self._state, "not_equals", value, tzinfo)
         return self._parent_obj
 
     def delta(self, value: date, td: timedelta, tzinfo=timezone.utc):
@@ -728,12 +1515,30 @@ class _DateQuery(_Query):
         else:
             end = datetime.combine(value, datetime.max.time(), tzinfo=tzinfo)
             start = end + td
-        self._gt_value = start
-        self._gt_operand = ">="
-        self._lt_value = end
-        self._lt_operand = "<="
+        self._state = self._state._replace(gt_value=start, gt_operand=">=", lt_value=end, lt_operand="<=")
         return self._parent_obj
 
+    def _next_state(self, state: _FieldState, operation: str, value) -> _FieldState:
+        if operation in ("equals", "not_equals"):
+            return self._date_state(state, operation, value, timezone.utc)
+        return super()._next_state(state, operation, value)
+
+    def _date_state(self, state: _FieldState, operation: str, value, tzinfo) -> _FieldState:
+        # a date (not a datetime) matches the whole day in tzinfo
+        self._check(value)
+        if isinstance(value, datetime) or not isinstance(value, date):
+            if operation == "equals":
+                return state._replace(eq_value=value)
+            return state._replace(ne_value=value)
+        start = datetime.combine(value, datetime.min.time(), tzinfo=tzinfo)
+        end = datetime.combine(value, datetime.max.time(), tzinfo=tzinfo)
+        if operation == "equals":
+            return state._replace(gt_value=start, gt_operand=">=", lt_value=end, lt_operand="<=")
+        return state._replace(gt_value=end, gt_operand=">=", lt_value=start, lt_operand="<=")
+
+    def _build_json_query(self):
+        return _isoformat_values(self._build_query())
+
     def _check(self, value):
         if isinstance(value, datetime):
             if value.tzinfo is None:
@@ -741,20 +1546,14 @@ class _DateQuery(_Query):
 
 
 class _NumberQuery(_Query):
-    _min_value = None
-    _max_value = None
-    _is_int = False
+    __slots__ = ()
 
     def equals(self, value):
         return super().equals(value)
 
     @classmethod
     def init_with_limits(cls, field_name, parent_obj: QueryBuilder, min_value=None, max_value=None, is_int=False):
-        c = _NumberQuery(field_name, parent_obj)
-        c._min_value = min_value
-        c._max_value = max_value
-        c._is_int = is_int
-        return c
+        return cls(_FieldMetadata(field_name, "number", min_value=min_value, max_value=max_value, is_int=is_int), parent_obj)
 
     def _greater_check(self, value):
         super(_NumberQuery, self)._greater_check(value)
@@ -765,26 +1564,39 @@ class _NumberQuery(_Query):
         self._check_range(value)
 
     def _check_range(self, value):
-        if self._min_value is not None and value < self._min_value:
+        if self._parent_obj._trusted:
+            return
+        meta = self._meta
+        if meta.min_value is not None and value < meta.min_value:
             raise ValueError(f"setting value of {value}, "
-                             f"can't be less than min value of {self._min_value} for {self._field_name}")
-        if self._max_value is not None and value > self._max_value:
+                             f"can't be less than min value of {meta.min_value} for {meta.field_name}")
+        if meta.max_value is not None and value > meta.max_value:
             raise ValueError(f"setting value of {value}, "
-                             f"can't be greater than max value of {self._max_value} for {self._field_name}")
+                             f"can't be greater than max value of {meta.max_value} for {meta.field_name}")
 
     def _check(self, value):
-        if self._is_int and not isinstance(value, int) and math.floor(value) != value:
+        if self._parent_obj._trusted:
+            return
+        if self._meta.is_int and not isinstance(value, int) and math.floor(value) != value:
             raise ValueError(f"for integer type, must use ints. {value} is not an int")
         self._check_range(value)
 
 
 class _SpatialQuery(_QueryBase):
-    _geometry = None
-    _is_null = None
+    __slots__ = ()
 
     def intersects(self, geometry: Union[BaseGeometry, dict]) -> QueryBuilder:
+        self._state = self._next_state(self._state, "intersects", geometry)
+        return self._parent_obj
+
+    def _next_state(self, state: _FieldState, operation: str, value) -> _FieldState:
+        if operation != "intersects":
+            return super()._next_state(state, operation, value)
+        geometry = value
         if isinstance(geometry, BaseGeometry):
-            self._geometry = geometry.__geo_interface__
+            geometry = geometry.__geo_interface__
+        elif isinstance(geometry, dict) and self._parent_obj._trusted:
+            pass
         elif isinstance(geometry, dict):
             # check to make sure geometry is correctly formatted
             try:
@@ -796,11 +1608,9 @@ class _SpatialQuery(_QueryBase):
                 else:
                     # check for geometries with x, y, and z defined
                     shape(geometry)
-            self._geometry = geometry
         else:
             raise ValueError("input must be shapely geometry or a geojson formatted dictionary")
-        self._is_null = None
-        return self._parent_obj
+        return _FieldState(geometry=geometry)
 
     def is_null(self) -> QueryBuilder:
         """
@@ -809,46 +1619,59 @@ class _SpatialQuery(_QueryBase):
         Returns:
             QueryBuilder: query builder for additional queries to add
         """
-        self._geometry = None
-        self._is_null = True
+        self._state = self._next_state(self._state, "is_null", None)
         return self._parent_obj
 
     def _build_query(self):
-        if self._is_null is not None:
+        state = self._state
+        if state.is_null is not None:
             return {
                 "op": "isNull",
-                "args": [self.property_obj]
+                "args": [self._shared_property_obj]
             }
-        if self._geometry is None:
+        if state.geometry is None:
             return None
 
         return {
             "op": "s_intersects",
             "args": [
-                self.property_obj,
-                self._geometry
+                self._shared_property_obj,
+                state.geometry
             ]
         }
 
 
 class _Extension:
     def __init__(self, query_block: QueryBuilder):
-        self._filter_expressions: list[_QueryTuple] = []
+        pass
 
-    def _build_query(self):
-        properties = list(vars(self).values())
-        args = [x._build_query() for x in properties if isinstance(x, _QueryBase) and x._build_query() is not None]
-        for query_filter in self._filter_expressions:
-            args.append(query_filter._build_query())
 
-        if len(args) == 0:
-            return []
-        return args
+class _LazyExtension(Generic[_ExtensionT]):
+    """
+    class attribute that builds an extension the first time it is accessed on a QueryBuilder.
+
+    the extension is cached in the instance ``__dict__``, so untouched extensions are never
+    constructed.
+    """
+    def __init__(self, extension_class: type[_ExtensionT]):
+        self._extension_class = extension_class
+        self._attr_name = None
+
+    def __set_name__(self, owner, name):
+        self._attr_name = name
+
+    def __get__(self, obj, objtype=None) -> _ExtensionT:
+        if obj is None:
+            return self
+        extension = self._extension_class(obj)
+        obj.__dict__[self._attr_name] = extension
+        return extension
 
 
 class EOCommonNameEnum(str, Enum):
     """
     EO Common Name Enum
+    Common Name of the band
     """
 
     pan = "pan"
@@ -873,41 +1696,6 @@ class EOCommonNameEnum(str, Enum):
     lwir12 = "lwir12"
 
 
-class _EOCommonNameEnumQuery(_EnumQuery):
-    """
-    EO Common Name Enum Query Interface
-    Common Name of the band
-    """
-
-    @classmethod
-    def init_enums(cls, field_name, parent_obj: QueryBuilder, enum_fields: list[str]):
-        o = _EOCommonNameEnumQuery(field_name, parent_obj)
-        o._enum_values = set(enum_fields)
-        return o
-
-    def equals(self, value: EOCommonNameEnum) -> QueryBuilder:
-        self._check([value.value])
-        self._eq_value = value.value
-        return self._parent_obj
-
-    def not_equals(self, value: EOCommonNameEnum) -> QueryBuilder:
-        self._check([value.value])
-        self._ne_value = value.value
-        return self._parent_obj
-
-    def in_set(self, values: list[EOCommonNameEnum]) -> QueryBuilder:
-        extracted = [x.value for x in values]
-        self._check(extracted)
-        self._in_values = extracted
-        return self._parent_obj
-
-    def not_in_set(self, values: list[EOCommonNameEnum]) -> QueryBuilder:
-        extracted = [x.value for x in values]
-        self._check(extracted)
-        self._not_in_values = extracted
-        return self._parent_obj
-
-
 class _EOExtension(_Extension):
     """
     STAC EO Extension for STAC Items and STAC Collections.
@@ -920,7 +1708,7 @@ class _EOExtension(_Extension):
         number query interface for searching items by the eo:center_wavelength field. Float input.
     cloud_cover: _NumberQuery
         number query interface for searching items by the eo:cloud_cover field where the minimum value is 0 and the max value is 100. Float input.
-    common_name : _EOCommonNameEnumQuery
+    common_name : _EnumQuery
         enum query interface for searching items by the eo:common_name field
     full_width_half_max: _NumberQuery
         number query interface for searching items by the eo:full_width_half_max field. Float input.
@@ -929,19 +1717,30 @@ class _EOExtension(_Extension):
     solar_illumination: _NumberQuery
         number query interface for searching items by the eo:solar_illumination field where the minimum value is 0. Float input.
     """
+    _field_registry = MappingProxyType({
+        "center_wavelength": _FieldMetadata("eo:center_wavelength", "number", min_value=None, max_value=None, is_int=False),
+        "cloud_cover": _FieldMetadata("eo:cloud_cover", "number", min_value=0, max_value=100, is_int=False),
+        "common_name": _enum_metadata("eo:common_name", EOCommonNameEnum),
+        "full_width_half_max": _FieldMetadata("eo:full_width_half_max", "number", min_value=None, max_value=None, is_int=False),
+        "snow_cover": _FieldMetadata("eo:snow_cover", "number", min_value=0, max_value=100, is_int=False),
+        "solar_illumination": _FieldMetadata("eo:solar_illumination", "number", min_value=0, max_value=None, is_int=False),
+    })
+
     def __init__(self, query_block: QueryBuilder):
         super().__init__(query_block)
-        self.center_wavelength = _NumberQuery.init_with_limits("eo:center_wavelength", query_block, min_value=None, max_value=None, is_int=False)
-        self.cloud_cover = _NumberQuery.init_with_limits("eo:cloud_cover", query_block, min_value=0, max_value=100, is_int=False)
-        self.common_name = _EOCommonNameEnumQuery.init_enums("eo:common_name", query_block, [x.value for x in EOCommonNameEnum])
-        self.full_width_half_max = _NumberQuery.init_with_limits("eo:full_width_half_max", query_block, min_value=None, max_value=None, is_int=False)
-        self.snow_cover = _NumberQuery.init_with_limits("eo:snow_cover", query_block, min_value=0, max_value=100, is_int=False)
-        self.solar_illumination = _NumberQuery.init_with_limits("eo:solar_illumination", query_block, min_value=0, max_value=None, is_int=False)
+        registry = self._field_registry
+        self.center_wavelength = _NumberQuery(registry["center_wavelength"], query_block)
+        self.cloud_cover = _NumberQuery(registry["cloud_cover"], query_block)
+        self.common_name = _EnumQuery(registry["common_name"], query_block)
+        self.full_width_half_max = _NumberQuery(registry["full_width_half_max"], query_block)
+        self.snow_cover = _NumberQuery(registry["snow_cover"], query_block)
+        self.solar_illumination = _NumberQuery(registry["solar_illumination"], query_block)
 
 
 class SARFrequencyBandEnum(str, Enum):
     """
     SAR Frequency Band Enum
+    Frequency Band
     """
 
     P = "P"
@@ -954,85 +1753,16 @@ class SARFrequencyBandEnum(str, Enum):
     Ka = "Ka"
 
 
-class _SARFrequencyBandEnumQuery(_EnumQuery):
-    """
-    SAR Frequency Band Enum Query Interface
-    Frequency Band
-    """
-
-    @classmethod
-    def init_enums(cls, field_name, parent_obj: QueryBuilder, enum_fields: list[str]):
-        o = _SARFrequencyBandEnumQuery(field_name, parent_obj)
-        o._enum_values = set(enum_fields)
-        return o
-
-    def equals(self, value: SARFrequencyBandEnum) -> QueryBuilder:
-        self._check([value.value])
-        self._eq_value = value.value
-        return self._parent_obj
-
-    def not_equals(self, value: SARFrequencyBandEnum) -> QueryBuilder:
-        self._check([value.value])
-        self._ne_value = value.value
-        return self._parent_obj
-
-    def in_set(self, values: list[SARFrequencyBandEnum]) -> QueryBuilder:
-        extracted = [x.value for x in values]
-        self._check(extracted)
-        self._in_values = extracted
-        return self._parent_obj
-
-    def not_in_set(self, values: list[SARFrequencyBandEnum]) -> QueryBuilder:
-        extracted = [x.value for x in values]
-        self._check(extracted)
-        self._not_in_values = extracted
-        return self._parent_obj
-
-
 class SARObservationDirectionEnum(str, Enum):
     """
     SAR Observation Direction Enum
+    Antenna pointing direction
     """
 
     left = "left"
     right = "right"
 
 
-class _SARObservationDirectionEnumQuery(_EnumQuery):
-    """
-    SAR Observation Direction Enum Query Interface
-    Antenna pointing direction
-    """
-
-    @classmethod
-    def init_enums(cls, field_name, parent_obj: QueryBuilder, enum_fields: list[str]):
-        o = _SARObservationDirectionEnumQuery(field_name, parent_obj)
-        o._enum_values = set(enum_fields)
-        return o
-
-    def equals(self, value: SARObservationDirectionEnum) -> QueryBuilder:
-        self._check([value.value])
-        self._eq_value = value.value
-        return self._parent_obj
-
-    def not_equals(self, value: SARObservationDirectionEnum) -> QueryBuilder:
-        self._check([value.value])
-        self._ne_value = value.value
-        return self._parent_obj
-
-    def in_set(self, values: list[SARObservationDirectionEnum]) -> QueryBuilder:
-        extracted = [x.value for x in values]
-        self._check(extracted)
-        self._in_values = extracted
-        return self._parent_obj
-
-    def not_in_set(self, values: list[SARObservationDirectionEnum]) -> QueryBuilder:
-        extracted = [x.value for x in values]
-        self._check(extracted)
-        self._not_in_values = extracted
-        return self._parent_obj
-
-
 class _SARExtension(_Extension):
     """
     STAC SAR Extension for STAC Items and STAC Collections.
@@ -1045,7 +1775,7 @@ class _SARExtension(_Extension):
         field can be checked to see if sar:beam_ids is null
     center_frequency: _NumberQuery
         number query interface for searching items by the sar:center_frequency field. Float input.
-    frequency_band : _SARFrequencyBandEnumQuery
+    frequency_band : _EnumQuery
         enum query interface for searching items by the sar:frequency_band field
     instrument_mode : _StringQuery
         string query interface for searching items by the sar:instrument_mode field
@@ -1055,7 +1785,7 @@ class _SARExtension(_Extension):
         number query interface for searching items by the sar:looks_equivalent_number field where the minimum value is 0. Float input.
     looks_range: _NumberQuery
         number query interface for searching items by the sar:looks_range field where the minimum value is 0. Float input.. Integer input.
-    observation_direction : _SARObservationDirectionEnumQuery
+    observation_direction : _EnumQuery
         enum query interface for searching items by the sar:observation_direction field
     pixel_spacing_azimuth: _NumberQuery
         number query interface for searching items by the sar:pixel_spacing_azimuth field where the minimum value is 0. Float input.
@@ -1070,27 +1800,46 @@ class _SARExtension(_Extension):
     resolution_range: _NumberQuery
         number query interface for searching items by the sar:resolution_range field where the minimum value is 0. Float input.
     """
+    _field_registry = MappingProxyType({
+        "beam_ids": _FieldMetadata("sar:beam_ids", "object"),
+        "center_frequency": _FieldMetadata("sar:center_frequency", "number", min_value=None, max_value=None, is_int=False),
+        "frequency_band": _enum_metadata("sar:frequency_band", SARFrequencyBandEnum),
+        "instrument_mode": _FieldMetadata("sar:instrument_mode", "string"),
+        "looks_azimuth": _FieldMetadata("sar:looks_azimuth", "number", min_value=0, max_value=None, is_int=True),
+        "looks_equivalent_number": _FieldMetadata("sar:looks_equivalent_number", "number", min_value=0, max_value=None, is_int=False),
+        "looks_range": _FieldMetadata("sar:looks_range", "number", min_value=0, max_value=None, is_int=True),
+        "observation_direction": _enum_metadata("sar:observation_direction", SARObservationDirectionEnum),
+        "pixel_spacing_azimuth": _FieldMetadata("sar:pixel_spacing_azimuth", "number", min_value=0, max_value=None, is_int=False),
+        "pixel_spacing_range": _FieldMetadata("sar:pixel_spacing_range", "number", min_value=0, max_value=None, is_int=False),
+        "polarizations": _FieldMetadata("sar:polarizations", "object"),
+        "product_type": _FieldMetadata("sar:product_type", "string"),
+        "resolution_azimuth": _FieldMetadata("sar:resolution_azimuth", "number", min_value=0, max_value=None, is_int=False),
+        "resolution_range": _FieldMetadata("sar:resolution_range", "number", min_value=0, max_value=None, is_int=False),
+    })
+
     def __init__(self, query_block: QueryBuilder):
         super().__init__(query_block)
-        self.beam_ids = _NullCheck("sar:beam_ids", query_block)
-        self.center_frequency = _NumberQuery.init_with_limits("sar:center_frequency", query_block, min_value=None, max_value=None, is_int=False)
-        self.frequency_band = _SARFrequencyBandEnumQuery.init_enums("sar:frequency_band", query_block, [x.value for x in SARFrequencyBandEnum])
-        self.instrument_mode = _StringQuery("sar:instrument_mode", query_block)
-        self.looks_azimuth = _NumberQuery.init_with_limits("sar:looks_azimuth", query_block, min_value=0, max_value=None, is_int=True)
-        self.looks_equivalent_number = _NumberQuery.init_with_limits("sar:looks_equivalent_number", query_block, min_value=0, max_value=None, is_int=False)
-        self.looks_range = _NumberQuery.init_with_limits("sar:looks_range", query_block, min_value=0, max_value=None, is_int=True)
-        self.observation_direction = _SARObservationDirectionEnumQuery.init_enums("sar:observation_direction", query_block, [x.value for x in SARObservationDirectionEnum])
-        self.pixel_spacing_azimuth = _NumberQuery.init_with_limits("sar:pixel_spacing_azimuth", query_block, min_value=0, max_value=None, is_int=False)
-        self.pixel_spacing_range = _NumberQuery.init_with_limits("sar:pixel_spacing_range", query_block, min_value=0, max_value=None, is_int=False)
-        self.polarizations = _NullCheck("sar:polarizations", query_block)
-        self.product_type = _StringQuery("sar:product_type", query_block)
-        self.resolution_azimuth = _NumberQuery.init_with_limits("sar:resolution_azimuth", query_block, min_value=0, max_value=None, is_int=False)
-        self.resolution_range = _NumberQuery.init_with_limits("sar:resolution_range", query_block, min_value=0, max_value=None, is_int=False)
+        registry = self._field_registry
+        self.beam_ids = _NullCheck(registry["beam_ids"], query_block)
+        self.center_frequency = _NumberQuery(registry["center_frequency"], query_block)
+        self.frequency_band = _EnumQuery(registry["frequency_band"], query_block)
+        self.instrument_mode = _StringQuery(registry["instrument_mode"], query_block)
+        self.looks_azimuth = _NumberQuery(registry["looks_azimuth"], query_block)
+        self.looks_equivalent_number = _NumberQuery(registry["looks_equivalent_number"], query_block)
+        self.looks_range = _NumberQuery(registry["looks_range"], query_block)
+        self.observation_direction = _EnumQuery(registry["observation_direction"], query_block)
+        self.pixel_spacing_azimuth = _NumberQuery(registry["pixel_spacing_azimuth"], query_block)
+        self.pixel_spacing_range = _NumberQuery(registry["pixel_spacing_range"], query_block)
+        self.polarizations = _NullCheck(registry["polarizations"], query_block)
+        self.product_type = _StringQuery(registry["product_type"], query_block)
+        self.resolution_azimuth = _NumberQuery(registry["resolution_azimuth"], query_block)
+        self.resolution_range = _NumberQuery(registry["resolution_range"], query_block)
 
 
 class SATOrbitStateEnum(str, Enum):
     """
     SAT Orbit State Enum
+    Orbit State
     """
 
     ascending = "ascending"
@@ -1098,41 +1847,6 @@ class SATOrbitStateEnum(str, Enum):
     geostationary = "geostationary"
 
 
-class _SATOrbitStateEnumQuery(_EnumQuery):
-    """
-    SAT Orbit State Enum Query Interface
-    Orbit State
-    """
-
-    @classmethod
-    def init_enums(cls, field_name, parent_obj: QueryBuilder, enum_fields: list[str]):
-        o = _SATOrbitStateEnumQuery(field_name, parent_obj)
-        o._enum_values = set(enum_fields)
-        return o
-
-    def equals(self, value: SATOrbitStateEnum) -> QueryBuilder:
-        self._check([value.value])
-        self._eq_value = value.value
-        return self._parent_obj
-
-    def not_equals(self, value: SATOrbitStateEnum) -> QueryBuilder:
-        self._check([value.value])
-        self._ne_value = value.value
-        return self._parent_obj
-
-    def in_set(self, values: list[SATOrbitStateEnum]) -> QueryBuilder:
-        extracted = [x.value for x in values]
-        self._check(extracted)
-        self._in_values = extracted
-        return self._parent_obj
-
-    def not_in_set(self, values: list[SATOrbitStateEnum]) -> QueryBuilder:
-        extracted = [x.value for x in values]
-        self._check(extracted)
-        self._not_in_values = extracted
-        return self._parent_obj
-
-
 class _SatExtension(_Extension):
     """
     STAC Sat Extension to a STAC Item.
@@ -1147,7 +1861,7 @@ class _SatExtension(_Extension):
         datetime query interface for searching items by the sat:anx_datetime field
     orbit_cycle: _NumberQuery
         number query interface for searching items by the sat:orbit_cycle field where the minimum value is 1. Float input.. Integer input.
-    orbit_state : _SATOrbitStateEnumQuery
+    orbit_state : _EnumQuery
         enum query interface for searching items by the sat:orbit_state field
     orbit_state_vectors : _NullCheck
         field can be checked to see if sat:orbit_state_vectors is null
@@ -1156,15 +1870,26 @@ class _SatExtension(_Extension):
     relative_orbit: _NumberQuery
         number query interface for searching items by the sat:relative_orbit field where the minimum value is 1. Float input.. Integer input.
     """
+    _field_registry = MappingProxyType({
+        "absolute_orbit": _FieldMetadata("sat:absolute_orbit", "number", min_value=1, max_value=None, is_int=True),
+        "anx_datetime": _FieldMetadata("sat:anx_datetime", "datetime"),
+        "orbit_cycle": _FieldMetadata("sat:orbit_cycle", "number", min_value=1, max_value=None, is_int=True),
+        "orbit_state": _enum_metadata("sat:orbit_state", SATOrbitStateEnum),
+        "orbit_state_vectors": _FieldMetadata("sat:orbit_state_vectors", "object"),
+        "platform_international_designator": _FieldMetadata("sat:platform_international_designator", "string"),
+        "relative_orbit": _FieldMetadata("sat:relative_orbit", "number", min_value=1, max_value=None, is_int=True),
+    })
+
     def __init__(self, query_block: QueryBuilder):
         super().__init__(query_block)
-        self.absolute_orbit = _NumberQuery.init_with_limits("sat:absolute_orbit", query_block, min_value=1, max_value=None, is_int=True)
-        self.anx_datetime = _DateQuery("sat:anx_datetime", query_block)
-        self.orbit_cycle = _NumberQuery.init_with_limits("sat:orbit_cycle", query_block, min_value=1, max_value=None, is_int=True)
-        self.orbit_state = _SATOrbitStateEnumQuery.init_enums("sat:orbit_state", query_block, [x.value for x in SATOrbitStateEnum])
-        self.orbit_state_vectors = _NullCheck("sat:orbit_state_vectors", query_block)
-        self.platform_international_designator = _StringQuery("sat:platform_international_designator", query_block)
-        self.relative_orbit = _NumberQuery.init_with_limits("sat:relative_orbit", query_block, min_value=1, max_value=None, is_int=True)
+        registry = self._field_registry
+        self.absolute_orbit = _NumberQuery(registry["absolute_orbit"], query_block)
+        self.anx_datetime = _DateQuery(registry["anx_datetime"], query_block)
+        self.orbit_cycle = _NumberQuery(registry["orbit_cycle"], query_block)
+        self.orbit_state = _EnumQuery(registry["orbit_state"], query_block)
+        self.orbit_state_vectors = _NullCheck(registry["orbit_state_vectors"], query_block)
+        self.platform_international_designator = _StringQuery(registry["platform_international_designator"], query_block)
+        self.relative_orbit = _NumberQuery(registry["relative_orbit"], query_block)
 
 
 class _ViewExtension(_Extension):
@@ -1186,13 +1911,22 @@ class _ViewExtension(_Extension):
     sun_elevation: _NumberQuery
         number query interface for searching items by the view:sun_elevation field where the minimum value is -90 and the max value is 90. Float input.
     """
+    _field_registry = MappingProxyType({
+        "azimuth": _FieldMetadata("view:azimuth", "number", min_value=0, max_value=360, is_int=False),
+        "incidence_angle": _FieldMetadata("view:incidence_angle", "number", min_value=0, max_value=90, is_int=False),
+        "off_nadir": _FieldMetadata("view:off_nadir", "number", min_value=0, max_value=90, is_int=False),
+        "sun_azimuth": _FieldMetadata("view:sun_azimuth", "number", min_value=0, max_value=360, is_int=False),
+        "sun_elevation": _FieldMetadata("view:sun_elevation", "number", min_value=-90, max_value=90, is_int=False),
+    })
+
     def __init__(self, query_block: QueryBuilder):
         super().__init__(query_block)
-        self.azimuth = _NumberQuery.init_with_limits("view:azimuth", query_block, min_value=0, max_value=360, is_int=False)
-        self.incidence_angle = _NumberQuery.init_with_limits("view:incidence_angle", query_block, min_value=0, max_value=90, is_int=False)
-        self.off_nadir = _NumberQuery.init_with_limits("view:off_nadir", query_block, min_value=0, max_value=90, is_int=False)
-        self.sun_azimuth = _NumberQuery.init_with_limits("view:sun_azimuth", query_block, min_value=0, max_value=360, is_int=False)
-        self.sun_elevation = _NumberQuery.init_with_limits("view:sun_elevation", query_block, min_value=-90, max_value=90, is_int=False)
+        registry = self._field_registry
+        self.azimuth = _NumberQuery(registry["azimuth"], query_block)
+        self.incidence_angle = _NumberQuery(registry["incidence_angle"], query_block)
+        self.off_nadir = _NumberQuery(registry["off_nadir"], query_block)
+        self.sun_azimuth = _NumberQuery(registry["sun_azimuth"], query_block)
+        self.sun_elevation = _NumberQuery(registry["sun_elevation"], query_block)
 
 
 class QueryBuilder:
@@ -1230,35 +1964,205 @@ class QueryBuilder:
     """
     _sort_by_field = None
     _sort_by_direction = "asc"
-
-    def __init__(self):
+    _trusted = False
+    # incremented on every change to queries, filters or sort order. serialized output is
+    # memoized in _dump_cache until the version moves on
+    _version = 0
+    _dump_cache: Optional[dict] = None
+    _dump_cache_version = 0
+    # JSON fragment per (json backend, field name), shared with forks: (token, fragment)
+    _fragment_cache: Optional[dict] = None
+    # JSON fragment per (json backend, filter), owned by this builder so a fork's filters don't
+    # keep it alive
+    _filter_fragment_cache: Optional[dict] = None
+    eo = _LazyExtension(_EOExtension)
+    sar = _LazyExtension(_SARExtension)
+    sat = _LazyExtension(_SatExtension)
+    view = _LazyExtension(_ViewExtension)
+    _field_registry = MappingProxyType({
+        "id": _FieldMetadata("id", "string"),
+        "collection": _FieldMetadata("collection", "string"),
+        "datetime": _FieldMetadata("datetime", "datetime"),
+        "geometry": _FieldMetadata("geometry", "geometry"),
+        "created": _FieldMetadata("created", "datetime"),
+        "updated": _FieldMetadata("updated", "datetime"),
+        "start_datetime": _FieldMetadata("start_datetime", "datetime"),
+        "end_datetime": _FieldMetadata("end_datetime", "datetime"),
+        "platform": _FieldMetadata("platform", "string"),
+        "constellation": _FieldMetadata("constellation", "string"),
+        "mission": _FieldMetadata("mission", "string"),
+        "gsd": _FieldMetadata("gsd", "number", min_value=0),
+    })
+    # STAC property name -> accessor for the field query object, in query_dump order
+    _field_accessors = MappingProxyType({
+        "id": attrgetter("id"),
+        "collection": attrgetter("collection"),
+        "datetime": attrgetter("datetime"),
+        "geometry": attrgetter("geometry"),
+        "created": attrgetter("created"),
+        "updated": attrgetter("updated"),
+        "start_datetime": attrgetter("start_datetime"),
+        "end_datetime": attrgetter("end_datetime"),
+        "platform": attrgetter("platform"),
+        "constellation": attrgetter("constellation"),
+        "mission": attrgetter("mission"),
+        "gsd": attrgetter("gsd"),
+        "eo:center_wavelength": attrgetter("eo.center_wavelength"),
+        "eo:cloud_cover": attrgetter("eo.cloud_cover"),
+        "eo:common_name": attrgetter("eo.common_name"),
+        "eo:full_width_half_max": attrgetter("eo.full_width_half_max"),
+        "eo:snow_cover": attrgetter("eo.snow_cover"),
+        "eo:solar_illumination": attrgetter("eo.solar_illumination"),
+        "sar:beam_ids": attrgetter("sar.beam_ids"),
+        "sar:center_frequency": attrgetter("sar.center_frequency"),
+        "sar:frequency_band": attrgetter("sar.frequency_band"),
+        "sar:instrument_mode": attrgetter("sar.instrument_mode"),
+        "sar:looks_azimuth": attrgetter("sar.looks_azimuth"),
+        "sar:looks_equivalent_number": attrgetter("sar.looks_equivalent_number"),
+        "sar:looks_range": attrgetter("sar.looks_range"),
+        "sar:observation_direction": attrgetter("sar.observation_direction"),
+        "sar:pixel_spacing_azimuth": attrgetter("sar.pixel_spacing_azimuth"),
+        "sar:pixel_spacing_range": attrgetter("sar.pixel_spacing_range"),
+        "sar:polarizations": attrgetter("sar.polarizations"),
+        "sar:product_type": attrgetter("sar.product_type"),
+        "sar:resolution_azimuth": attrgetter("sar.resolution_azimuth"),
+        "sar:resolution_range": attrgetter("sar.resolution_range"),
+        "sat:absolute_orbit": attrgetter("sat.absolute_orbit"),
+        "sat:anx_datetime": attrgetter("sat.anx_datetime"),
+        "sat:orbit_cycle": attrgetter("sat.orbit_cycle"),
+        "sat:orbit_state": attrgetter("sat.orbit_state"),
+        "sat:orbit_state_vectors": attrgetter("sat.orbit_state_vectors"),
+        "sat:platform_international_designator": attrgetter("sat.platform_international_designator"),
+        "sat:relative_orbit": attrgetter("sat.relative_orbit"),
+        "view:azimuth": attrgetter("view.azimuth"),
+        "view:incidence_angle": attrgetter("view.incidence_angle"),
+        "view:off_nadir": attrgetter("view.off_nadir"),
+        "view:sun_azimuth": attrgetter("view.sun_azimuth"),
+        "view:sun_elevation": attrgetter("view.sun_elevation"),
+    })
+    _field_order = MappingProxyType({field_name: i for i, field_name in enumerate(_field_accessors)})
+    # identifies the field table that binary encoded queries intern property names against
+    _field_table_crc = zlib.crc32("\n".join(_field_accessors).encode())
+
+    def __init__(self, trusted: bool = False):
+        """
+        Args:
+            trusted (bool): skip number range, enum and geometry validation and string
+                conversion for inputs that were already validated upstream. see `unchecked`
+        """
+        if trusted:
+            self._trusted = True
         self._filter_expressions: list[_QueryTuple] = []
-        self.id = _StringQuery("id", self)
-        self.collection = _StringQuery("collection", self)
-        self.datetime = _DateQuery("datetime", self)
-        self.geometry = _SpatialQuery("geometry", self)
-        self.created = _DateQuery("created", self)
-        self.updated = _DateQuery("updated", self)
-        self.start_datetime = _DateQuery("start_datetime", self)
-        self.end_datetime = _DateQuery("end_datetime", self)
-        self.platform = _StringQuery("platform", self)
-        self.constellation = _StringQuery("constellation", self)
-        self.mission = _StringQuery("mission", self)
-        self.gsd = _NumberQuery.init_with_limits("gsd", self, min_value=0)
-        self.eo = _EOExtension(self)
-        self.sar = _SARExtension(self)
-        self.sat = _SatExtension(self)
-        self.view = _ViewExtension(self)
-
-    def query_dump(self, top_level_is_or=False, limit: Optional[int] = None):
-        properties = list(vars(self).values())
-        args = [x._build_query() for x in properties if isinstance(x, _QueryBase) and x._build_query() is not None]
-        for query_filter in self._filter_expressions:
-            args.append(query_filter._build_query())
-
-        for p in properties:
-            if isinstance(p, _Extension):
-                args.extend(p._build_query())
+        self._field_state: dict[str, _FieldState] = {}
+        self._filters_shared = False
+        self._field_state_shared = False
+        registry = self._field_registry
+        self.id = _StringQuery(registry["id"], self)
+        self.collection = _StringQuery(registry["collection"], self)
+        self.datetime = _DateQuery(registry["datetime"], self)
+        self.geometry = _SpatialQuery(registry["geometry"], self)
+        self.created = _DateQuery(registry["created"], self)
+        self.updated = _DateQuery(registry["updated"], self)
+        self.start_datetime = _DateQuery(registry["start_datetime"], self)
+        self.end_datetime = _DateQuery(registry["end_datetime"], self)
+        self.platform = _StringQuery(registry["platform"], self)
+        self.constellation = _StringQuery(registry["constellation"], self)
+        self.mission = _StringQuery(registry["mission"], self)
+        self.gsd = _NumberQuery(registry["gsd"], self)
+
+    def query_dump(self, top_level_is_or=False, limit: Optional[int] = None, normalize=False,
+                   drop_tautologies=False):
+        """
+        build the cql2-json post body for this query. the body is memoized until the builder is
+        modified, and each call returns a copy that the caller is free to change.
+
+        Args:
+            top_level_is_or (bool): join the top level predicates with 'or' instead of 'and'
+            limit (Optional[int]): maximum number of items to return
+            normalize (bool): flatten nested and/or chains, e.g. the 'and' around a range or a
+                filter, into their parent and unwrap and/or nodes with a single arg. the
+                filter is equivalent, with less nesting for the server to parse
+            drop_tautologies (bool): normalize, then drop predicates that the schema limits and
+                enum domains already imply, e.g. `eo.cloud_cover.lte(100)` or an in_set of every
+                enum member. this assumes every item has the property: a dropped predicate no
+                longer excludes items where the property is missing
+
+        Returns:
+            Optional[dict]: post body, or None if no queries are set or every predicate was dropped
+        """
+        return _copy_tree(self._query_dump_tree(top_level_is_or, limit, normalize, drop_tautologies))
+
+    def _query_dump_tree(self, top_level_is_or=False, limit: Optional[int] = None, normalize=False,
+                         drop_tautologies=False):
+        # the memoized query_dump body, shared by every caller. it must not be modified
+        if drop_tautologies:
+            return self._memoized(("query_dump_without_tautologies", top_level_is_or, limit),
+                                  lambda: self._query_dump_without_tautologies(top_level_is_or, limit))
+        if normalize:
+            return self._memoized(("query_dump_normalized", top_level_is_or, limit),
+                                  lambda: _normalize_query(self._query_dump_tree(top_level_is_or, limit)))
+        return self._memoized(("query_dump", top_level_is_or, limit),
+                              lambda: self._query_dump(top_level_is_or, limit))
+
+    def _query_dump_without_tautologies(self, top_level_is_or, limit):
+        query = self._query_dump_tree(top_level_is_or, limit, normalize=True)
+        if query is None:
+            return None
+        query_filter = _drop_tautologies(query["filter"], self._field_metadata)
+        if query_filter is None:
+            return None
+        return {**query, "filter": query_filter}
+
+    def _field_metadata(self, field_name: str) -> Optional[_FieldMetadata]:
+        if field_name not in self._field_accessors:
+            return None
+        return self._field_accessors[field_name](self)._meta
+
+    def _predicates(self) -> list[tuple[Any, Any, Union[_QueryBase, _QueryTuple]]]:
+        """
+        (cache key, immutable token, predicate) for every field that was set and every filter,
+        in query_dump order. a field's token is its current _FieldState record, so a cached
+        fragment is valid for as long as the token is the same object.
+        """
+        predicates = []
+        extension_predicates = []
+        field_state = self._field_state
+        # only fields that were set have an entry in _field_state, so this scales with the
+        # number of predicates rather than the number of fields
+        order = self._field_order
+        unordered = len(order)
+        # fields a subclass added outside the generated field table sort after the others, in
+        # the order they were set
+        for field_name in sorted(field_state, key=lambda x: order.get(x, unordered)):
+            accessor = self._field_accessors.get(field_name)
+            field = accessor(self) if accessor is not None else self._unregistered_field(field_name)
+            if field is None:
+                continue
+            predicate = (field_name, field_state[field_name], field)
+            # extension properties are namespaced (`eo:cloud_cover`) and follow the filters
+            if ":" in field_name:
+                extension_predicates.append(predicate)
+            else:
+                predicates.append(predicate)
+        predicates.extend((x, x, x) for x in self._filter_expressions)
+        predicates.extend(extension_predicates)
+        return predicates
+
+    def _unregistered_field(self, field_name: str) -> Optional[_QueryBase]:
+        # e.g. `self.custom = _NumberQuery.init_with_limits("custom:val", self, 0, 10)` in a subclass
+        extensions = (x for x in vars(self).values() if isinstance(x, _Extension))
+        for owner in chain((self,), extensions):
+            for value in vars(owner).values():
+                if isinstance(value, _QueryBase) and value._meta.field_name == field_name:
+                    return value
+        return None
+
+    def _query_dump(self, top_level_is_or, limit):
+        args = []
+        for _, _, predicate in self._predicates():
+            predicate_query = predicate._build_query()
+            if predicate_query is not None:
+                args.append(predicate_query)
 
         if len(args) == 0:
             return None
@@ -1277,29 +2181,586 @@ class QueryBuilder:
             post_body["sortby"] = [{"field": self._sort_by_field, "direction": self._sort_by_direction}]
         return post_body
 
-    def query_dump_json(self, top_level_is_or=False, indent=None, sort_keys=False, limit: Optional[int] = None):
-        return json.dumps(self.query_dump(top_level_is_or=top_level_is_or, limit=limit),
+    def query_dump_json(self, top_level_is_or=False, indent=None, sort_keys=False, limit: Optional[int] = None,
+                        normalize=False, drop_tautologies=False):
+        return self._memoized(("query_dump_json", _json_backend.name, top_level_is_or, indent, sort_keys, limit, normalize,
+                               drop_tautologies),
+                              lambda: self._query_dump_json(top_level_is_or, indent, sort_keys, limit, normalize,
+                                                            drop_tautologies))
+
+    def _query_dump_json(self, top_level_is_or, indent, sort_keys, limit, normalize=False, drop_tautologies=False):
+        query_dump_kwargs = {"top_level_is_or": top_level_is_or, "limit": limit,
+                             "normalize": normalize, "drop_tautologies": drop_tautologies}
+        if indent is None and not sort_keys:
+            if normalize or drop_tautologies:
+                # the predicate fragments can't be spliced once the nesting changes
+                return _json_backend.dumps(_isoformat_values(self._query_dump_tree(**query_dump_kwargs)))
+            return self._spliced_query_dump_json(top_level_is_or, limit)
+        return json.dumps(self._query_dump_tree(**query_dump_kwargs),
                           indent=indent,
+                          separators=None if indent is not None else (",", ":"),
                           sort_keys=sort_keys,
                           cls=_DateTimeEncoder)
 
-    def query_summary(self, top_level_is_or=False, limit: Optional[int] = None, multiline=True):
-        query = self.query_dump(top_level_is_or=top_level_is_or, limit=limit)
+    def query_dump_bytes(self, top_level_is_or=False, limit: Optional[int] = None) -> bytes:
+        """
+        build the `query_dump_json` body as UTF-8 bytes, ready to send as a POST body. the
+        body is assembled from the same cached predicate fragments, without a str copy.
+
+        Args:
+            top_level_is_or (bool): join the top level predicates with 'or' instead of 'and'
+            limit (Optional[int]): maximum number of items to return
+
+        Returns:
+            bytes: compact cql2-json body, or b"null" if no queries are set
+        """
+        return self._memoized(("query_dump_bytes", _json_backend.name, top_level_is_or, limit),
+                              lambda: self._spliced_query_dump_bytes(top_level_is_or, limit))
+
+    def _spliced_query_dump_json(self, top_level_is_or, limit):
+        return self._spliced_query_dump_bytes(top_level_is_or, limit).decode()
+
+    def _spliced_query_dump_bytes(self, top_level_is_or, limit):
+        # each predicate is encoded once per state record and the body is assembled from the
+        # cached fragments, so changing one field doesn't re-encode e.g. a large geometry.
+        # the output matches json.dumps(self.query_dump(...), separators=(",", ":")).encode()
+        backend = _json_backend
+        dumps = backend.dumps_bytes
+        if self._fragment_cache is None:
+            self._fragment_cache = {}
+        if self._filter_fragment_cache is None:
+            self._filter_fragment_cache = {}
+        field_cache, filter_cache = self._fragment_cache, self._filter_fragment_cache
+        fragments = []
+        for key, token, predicate in self._predicates():
+            cache = field_cache if isinstance(key, str) else filter_cache
+            cache_key = (backend.name, key)
+            cached = cache.get(cache_key)
+            if cached is not None and cached[0] is token:
+                fragment = cached[1]
+            else:
+                predicate_query = predicate._build_json_query()
+                fragment = None if predicate_query is None else dumps(predicate_query)
+                cache[cache_key] = (token, fragment)
+            if fragment is not None:
+                fragments.append(fragment)
+
+        if len(fragments) == 0:
+            return dumps(None)
+        top_level_op = b"or" if top_level_is_or else b"and"
+        body = [b'{"filter-lang":"cql2-json","filter":{"op":"', top_level_op, b'","args":[', b",".join(fragments), b"]}"]
+        if limit:
+            body += [b',"limit":', dumps(limit)]
+        if self._sort_by_field:
+            body += [b',"sortby":', dumps([{"field": self._sort_by_field, "direction": self._sort_by_direction}])]
+        body.append(b"}")
+        return b"".join(body)
+
+    def query_dump_to(self, fp, top_level_is_or=False, limit: Optional[int] = None, chunk_size: int = 4096):
+        """
+        write the same compact JSON as `query_dump_json` to a file-like object, incrementally.
+        large coordinate lists and in_set values are encoded `chunk_size` elements at a time, so
+        the full body is never held in memory. binary streams receive UTF-8 encoded bytes.
+
+        Args:
+            fp: text or binary file-like object with a `write` method, e.g. a file or socket.makefile("wb").
+                it is written as text if it is an io.TextIOBase or its mode has no "b", otherwise as bytes
+            top_level_is_or (bool): join the top level predicates with 'or' instead of 'and'
+            limit (Optional[int]): maximum number of items to return
+            chunk_size (int): number of list elements encoded per write
+        """
+        # cached fragments are bytes, streamed output is str
+        if _is_binary_stream(fp):
+            def write(text: str):
+                fp.write(text.encode("utf-8"))
+            write_fragment = fp.write
+        else:
+            write = fp.write
+
+            def write_fragment(fragment: bytes):
+                fp.write(fragment.decode("utf-8"))
+        backend = _json_backend
+        dumps = backend.dumps
+        field_cache, filter_cache = self._fragment_cache or {}, self._filter_fragment_cache or {}
+        written = 0
+        for key, token, predicate in self._predicates():
+            cached = (field_cache if isinstance(key, str) else filter_cache).get((backend.name, key))
+            fragment = cached[1] if cached is not None and cached[0] is token else None
+            predicate_query = None if fragment is not None else predicate._build_json_query()
+            if fragment is None and predicate_query is None:
+                continue
+            if written == 0:
+                top_level_op = "or" if top_level_is_or else "and"
+                write('{"filter-lang":"cql2-json","filter":{"op":"' + top_level_op + '","args":[')
+            else:
+                write(",")
+            if fragment is not None:
+                write_fragment(fragment)
+            else:
+                _write_json(write, predicate_query, dumps, chunk_size)
+            written += 1
+        if written == 0:
+            write(dumps(None))
+            return
+        tail = "]}"
+        if limit:
+            tail += ',"limit":' + dumps(limit)
+        if self._sort_by_field:
+            tail += ',"sortby":' + dumps([{"field": self._sort_by_field, "direction": self._sort_by_direction}])
+        write(tail + "}")
+
+    def is_unsatisfiable(self, top_level_is_or=False) -> bool:
+        """
+        check the field predicates and filters for contradictions that no item can match, e.g.
+        `eo.cloud_cover.gt(80)` with a `filter(q.eo.cloud_cover < 10)`, an equals value that a
+        not_in_set excludes, disjoint datetime windows, or is_null with any other predicate on
+        the same property. use it to skip searches that can only return nothing.
+
+        the check is conservative: True means the query is proven unsatisfiable, False means no
+        contradiction was found.
+
+        Args:
+            top_level_is_or (bool): join the top level predicates with 'or' instead of 'and'
+
+        Returns:
+            bool: True if the query can't match any item
+        """
+        def build():
+            query = self._query_dump_tree(top_level_is_or, normalize=True)
+            return query is not None and _unsatisfiable(query["filter"])
+        return self._memoized(("is_unsatisfiable", top_level_is_or), build)
+
+    def query_dump_canonical(self, top_level_is_or=False, limit: Optional[int] = None):
+        """
+        `query_dump` in canonical form, so builders that express the same query produce equal
+        dicts regardless of the order predicates, filters and in_set values were added in. the
+        query is normalized (see `query_dump`), and/or args and in_set values are sorted and
+        deduplicated, datetimes are RFC 3339 UTC strings ending in "Z", whole floats are ints,
+        and polygon rings start at their lowest vertex with counterclockwise exteriors and
+        clockwise holes.
+
+        Args:
+            top_level_is_or (bool): join the top level predicates with 'or' instead of 'and'
+            limit (Optional[int]): maximum number of items to return
+
+        Returns:
+            Optional[dict]: canonical post body, or None if no queries are set
+        """
+        return self._memoized(("query_dump_canonical", top_level_is_or, limit),
+                              lambda: _canonical_query(self._query_dump_tree(top_level_is_or, limit, normalize=True)))
+
+    def fingerprint(self, top_level_is_or=False, limit: Optional[int] = None) -> str:
+        """
+        stable hash of `query_dump_canonical`, e.g. as a key for caching search results. it is
+        the same across processes and python versions for semantically identical builders.
+
+        Returns:
+            str: sha256 hex digest
+        """
+        return self._memoized(("fingerprint", top_level_is_or, limit),
+                              lambda: hashlib.sha256(_canonical_json(self.query_dump_canonical(
+                                  top_level_is_or=top_level_is_or, limit=limit)).encode()).hexdigest())
+
+    def query_dump_binary(self, top_level_is_or=False, limit: Optional[int] = None) -> bytes:
+        """
+        compact binary encoding of `query_dump`, e.g. for queueing queries between services.
+        property names are interned against this builder's fields, and numbers, datetimes and
+        coordinates are packed natively. decode with `QueryBuilder.query_load_binary`, using a
+        builder generated with the same fields.
+
+        Args:
+            top_level_is_or (bool): join the top level predicates with 'or' instead of 'and'
+            limit (Optional[int]): maximum number of items to return
+
+        Returns:
+            bytes: versioned binary encoding
+        """
+        def build():
+            out = bytearray(_BINARY_HEADER.pack(_BINARY_MAGIC, _BINARY_VERSION, self._field_table_crc))
+            _binary_encode(out, self._query_dump_tree(top_level_is_or, limit), self._field_order)
+            return bytes(out)
+        return self._memoized(("query_dump_binary", top_level_is_or, limit), build)
+
+    @classmethod
+    def query_load_binary(cls, data: bytes) -> Optional[dict]:
+        """
+        decode the output of `query_dump_binary` into the cql2-json post body. datetimes are
+        decoded as datetimes and coordinates as lists.
+
+        Args:
+            data (bytes): output of `query_dump_binary`
+
+        Returns:
+            Optional[dict]: post body, or None if the encoded query was empty
+        """
+        if len(data) < _BINARY_HEADER.size:
+            raise ValueError("not a binary encoded query")
+        magic, version, field_table_crc = _BINARY_HEADER.unpack_from(data)
+        if magic != _BINARY_MAGIC:
+            raise ValueError("not a binary encoded query")
+        if version != _BINARY_VERSION:
+            raise ValueError(f"binary query version {version} is not supported, expected {_BINARY_VERSION}")
+        if field_table_crc != cls._field_table_crc:
+            raise ValueError("binary query was encoded by a QueryBuilder with different fields")
+        return _BinaryReader(bytes(data), _BINARY_HEADER.size, tuple(cls._field_order)).read()
+
+    def query_dump_gzip(self, top_level_is_or=False, limit: Optional[int] = None,
+                        compresslevel: int = 1) -> CompressedBody:
+        """
+        gzip compressed `query_dump_json` body with its Content-Type and Content-Encoding headers.
+        the JSON is streamed into the compressor by `query_dump_to`, so the uncompressed body is
+        never held in memory, and the gzip header has no timestamp, so equal queries compress
+        to equal bytes.
+
+        Args:
+            top_level_is_or (bool): join the top level predicates with 'or' instead of 'and'
+            limit (Optional[int]): maximum number of items to return
+            compresslevel (int): gzip level from 1 (fastest) to 9 (smallest). coordinates compress
+                little better at higher levels, at several times the CPU cost
+
+        Returns:
+            CompressedBody: compressed body and the headers to send it with
+        """
+        def build():
+            buffer = io.BytesIO()
+            with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=compresslevel, mtime=0) as compressed:
+                # batch the many small writes of query_dump_to before they reach the compressor
+                with io.BufferedWriter(compressed, buffer_size=1 << 16) as writer:
+                    self.query_dump_to(writer, top_level_is_or=top_level_is_or, limit=limit)
+            return buffer.getvalue()
+        body = self._memoized(("query_dump_gzip", _json_backend.name, top_level_is_or, limit, compresslevel), build)
+        return CompressedBody(body, {"Content-Type": "application/json", "Content-Encoding": "gzip"})
+
+    def query_summary(self, top_level_is_or=False, limit: Optional[int] = None, multiline=True,
+                      max_value_chars: Optional[int] = None, max_chars: Optional[int] = None):
+        """
+        human readable summary of the query, e.g. for logging.
+
+        set the budgets to bound the size of the summary. values are truncated as they are rendered:
+        long in_set lists end with "... N more", geometries are shown as their type, vertex count and
+        bbox, and predicates past `max_chars` are counted rather than rendered.
+
+        Args:
+            top_level_is_or (bool): join the top level predicates with 'or' instead of 'and'
+            limit (Optional[int]): maximum number of items to return
+            multiline (bool): put each top level predicate on its own line
+            max_value_chars (Optional[int]): character budget for each value, defaults to `max_chars`
+            max_chars (Optional[int]): character budget for the whole summary
+
+        Returns:
+            Optional[str]: summary, or None if no queries are set
+        """
+        return self._memoized(("query_summary", top_level_is_or, limit, multiline, max_value_chars, max_chars),
+                              lambda: self._query_summary(top_level_is_or, limit, multiline, max_value_chars, max_chars))
+
+    def _query_summary(self, top_level_is_or, limit, multiline, max_value_chars, max_chars):
+        query = self._query_dump_tree(top_level_is_or, limit)
         if query is None:
             return None
 
-        lines = [_query_summary_filter(query["filter"], multiline=multiline)]
+        if max_value_chars is None:
+            max_value_chars = max_chars
+        lines = [_query_summary_filter(query["filter"], multiline=multiline,
+                                       max_value_chars=max_value_chars, max_chars=max_chars)]
         if "sortby" in query:
             sort_by = query["sortby"][0]
             lines.append(f"SORT BY {sort_by['field']} {sort_by['direction'].upper()}")
         if "limit" in query:
             lines.append(f"LIMIT {query['limit']}")
         separator = "\n" if multiline else " "
-        return separator.join(lines)
+        return _truncated(separator.join(lines), max_chars)
 
     def filter(self, *column_expression):
         query_tuple = column_expression[0]
+        if self._filters_shared:
+            self._filter_expressions = list(self._filter_expressions)
+            self._filters_shared = False
         self._filter_expressions.append(query_tuple)
+        self._version += 1
+
+    def fork(self) -> QueryBuilder:
+        """
+        create a new QueryBuilder that starts with all of this builder's queries, filters and sort
+        order. the two builders share their field state until either one of them is modified
+        (copy-on-write), so forking a populated builder and changing one field is much cheaper
+        than building each variant from scratch.
+
+        Returns:
+            QueryBuilder: independent query builder with the same queries as this one
+        """
+        child = self.__class__(trusted=self._trusted)
+        child._field_state = self._field_state
+        child._filter_expressions = self._filter_expressions
+        if self._fragment_cache is None:
+            self._fragment_cache = {}
+        child._fragment_cache = self._fragment_cache
+        if self._filter_fragment_cache:
+            # the child starts with the same filters, so their fragments can be reused
+            child._filter_fragment_cache = dict(self._filter_fragment_cache)
+        self._field_state_shared = child._field_state_shared = True
+        self._filters_shared = child._filters_shared = True
+        if "_sort_by_field" in self.__dict__:
+            child._sort_by_field = self._sort_by_field
+            child._sort_by_direction = self._sort_by_direction
+        return child
+
+    def field(self, field_name: str) -> _QueryBase:
+        """
+        look up the query interface for a field by its STAC property name, e.g. `eo:cloud_cover`
+
+        Args:
+            field_name (str): STAC property name
+
+        Returns:
+            _QueryBase: query interface for the field, the same object as attribute access returns
+        """
+        accessor = self._field_accessors.get(field_name)
+        if accessor is None:
+            raise ValueError(f"{field_name} is not a queryable field of this QueryBuilder")
+        return accessor(self)
+
+    def apply(self, query_spec: dict[str, dict[str, Any]]) -> QueryBuilder:
+        """
+        apply a mapping of STAC property names to operations in one pass, e.g.
+        `{"eo:cloud_cover": {"lt": 20}, "platform": {"in_set": ["landsat-8", "landsat-9"]}}`.
+        operation names are the field query method names, and `is_null` takes a boolean. every
+        predicate is validated before raising, and if any fail the builder is left unchanged.
+
+        Args:
+            query_spec (dict[str, dict[str, Any]]): operations keyed by STAC property name
+
+        Returns:
+            QueryBuilder: query builder for additional queries to add
+
+        Raises:
+            ValueError: listing every unknown field, operations that aren't a mapping, unsupported
+                operation and invalid value, including invalid geometries
+        """
+        # validate the whole spec and fold each field's operations into its new state record,
+        # then write every record at once
+        states = {}
+        errors = []
+        field_state = self._field_state
+        for field_name, operations in query_spec.items():
+            accessor = self._field_accessors.get(field_name)
+            if accessor is None:
+                errors.append(f"{field_name}: not a queryable field")
+                continue
+            if not isinstance(operations, Mapping):
+                errors.append(f"{field_name}: expected a mapping of operations, got {type(operations).__name__}")
+                continue
+            field = accessor(self)
+            current = states.get(field_name) or field_state.get(field_name, _EMPTY_STATE)
+            state = current
+            for operation, value in operations.items():
+                if operation not in _APPLY_OPERATIONS or not hasattr(field, operation):
+                    errors.append(f"{field_name}: unsupported operation {operation}")
+                    continue
+                if operation == "is_null" and not value:
+                    continue
+                try:
+                    state = field._next_state(state, operation, value)
+                except (ValueError, TypeError, AttributeError, ShapelyError) as e:
+                    errors.append(f"{field_name}: {operation} {e}")
+            if state is not current:
+                states[field_name] = state
+        if errors:
+            raise ValueError("invalid query spec:\n" + "\n".join(errors))
+        if states:
+            if self._field_state_shared:
+                self._field_state = dict(field_state)
+                self._field_state_shared = False
+            self._field_state.update(states)
+            self._version += 1
+        return self
+
+    def reset(self) -> QueryBuilder:
+        """
+        clear all queries, filters and sort order so the builder can be reused. only the fields
+        that were set are touched, and the field and extension objects are kept.
+
+        Returns:
+            QueryBuilder: this query builder, now empty
+        """
+        if self._field_state_shared:
+            self._field_state = {}
+            self._field_state_shared = False
+        else:
+            self._field_state.clear()
+        if self._filters_shared:
+            self._filter_expressions = []
+            self._filters_shared = False
+        else:
+            self._filter_expressions.clear()
+        self.__dict__.pop("_sort_by_field", None)
+        self.__dict__.pop("_sort_by_direction", None)
+        self._fragment_cache = None
+        self._filter_fragment_cache = None
+        self._version += 1
+        return self
+
+    @contextmanager
+    def unchecked(self) -> Iterator[QueryBuilder]:
+        """
+        context manager that puts the builder in trusted mode for the duration of the block.
+        setters skip number range and integer checks, enum membership checks, string and enum
+        value conversion and geometry validation, so inputs must already be valid.
+
+        Returns:
+            Iterator[QueryBuilder]: this query builder in trusted mode
+        """
+        trusted = self._trusted
+        self._trusted = True
+        try:
+            yield self
+        finally:
+            self._trusted = trusted
+
+    def _set_field_state(self, field_name: str, state: _FieldState):
+        if self._field_state_shared:
+            self._field_state = dict(self._field_state)
+            self._field_state_shared = False
+        self._field_state[field_name] = state
+        self._version += 1
+
+    def _set_sort_by(self, field_name: str, direction: str):
+        self._sort_by_field = field_name
+        self._sort_by_direction = direction
+        self._version += 1
+
+    def _memoized(self, key: tuple, build):
+        cache = self._dump_cache
+        if cache is None or self._dump_cache_version != self._version:
+            cache = self._dump_cache = {}
+            self._dump_cache_version = self._version
+        if key not in cache:
+            cache[key] = build()
+        return cache[key]
+
+
+class QueryBuilderPool:
+    """
+    thread-safe pool of QueryBuilder objects for long-lived workers.
+
+    builders are reset when they are released, so a borrowed builder is always empty.
+    """
+    def __init__(self, max_size: int = 16):
+        self._max_size = max_size
+        self._builders: list[QueryBuilder] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> QueryBuilder:
+        """
+        take an empty builder from the pool, or create one if the pool is empty
+
+        Returns:
+            QueryBuilder: empty query builder
+        """
+        with self._lock:
+            if self._builders:
+                return self._builders.pop()
+        return QueryBuilder()
+
+    def release(self, builder: QueryBuilder):
+        """
+        reset a builder and return it to the pool. builders beyond `max_size` are dropped, and so
+        are trusted builders, so a borrower never gets one with validation turned off.
+
+        Args:
+            builder (QueryBuilder): builder previously returned by `acquire`
+        """
+        if builder._trusted:
+            return
+        builder.reset()
+        with self._lock:
+            if len(self._builders) < self._max_size:
+                self._builders.append(builder)
+
+    @contextmanager
+    def borrow(self) -> Iterator[QueryBuilder]:
+        """
+        context manager that acquires a builder and releases it on exit
+
+        Returns:
+            Iterator[QueryBuilder]: empty query builder for the duration of the block
+        """
+        builder = self.acquire()
+        try:
+            yield builder
+        finally:
+            self.release(builder)
+
+
+def _ndjson_lines(queries: list, top_level_is_or: bool, limit: Optional[int], trusted: bool,
+                  json_backend: str) -> bytes:
+    # one NDJSON batch. query specs are applied to a single scratch builder that is reset between
+    # them. runs in the worker processes of query_dump_ndjson as well, hence the backend name
+    if _json_backend.name != json_backend:
+        set_json_backend(json_backend)
+    scratch = None
+    lines = []
+    for query in queries:
+        if isinstance(query, QueryBuilder):
+            lines.append(query.query_dump_bytes(top_level_is_or=top_level_is_or, limit=limit))
+            continue
+        if scratch is None:
+            scratch = QueryBuilder(trusted=trusted)
+        lines.append(scratch.reset().apply(query)._spliced_query_dump_bytes(top_level_is_or, limit))
+    lines.append(b"")
+    return b"\n".join(lines)
+
+
+def query_dump_ndjson(queries: Iterable[Union[QueryBuilder, dict[str, dict[str, Any]]]], fp,
+                      top_level_is_or=False, limit: Optional[int] = None, trusted: bool = False,
+                      processes: Optional[int] = None, batch_size: int = 1_000) -> int:
+    """
+    write the `query_dump_json` body of many queries to a file-like object as newline-delimited
+    JSON, one line per query and in input order. queries are QueryBuilders or `QueryBuilder.apply`
+    specs, which are applied to one reused builder. lines are written `batch_size` at a time, and
+    `queries` is consumed lazily, so it can be a generator of any length. a query with no
+    predicates is written as `null`.
+
+    Args:
+        queries (Iterable[Union[QueryBuilder, dict[str, dict[str, Any]]]]): builders or apply specs
+        fp: text or binary file-like object with a `write` method, detected as in `QueryBuilder.query_dump_to`
+        top_level_is_or (bool): join the top level predicates with 'or' instead of 'and'
+        limit (Optional[int]): maximum number of items to return
+        trusted (bool): skip validation when applying specs, see `QueryBuilder(trusted=True)`
+        processes (Optional[int]): encode batches in a pool of this many processes
+        batch_size (int): number of queries encoded and written at a time
+
+    Returns:
+        int: number of lines written
+    """
+    if _is_binary_stream(fp):
+        write = fp.write
+    else:
+        def write(data: bytes):
+            fp.write(data.decode("utf-8"))
+    iterator = iter(queries)
+    batches = iter(lambda: list(islice(iterator, batch_size)), [])
+    written = 0
+    if processes is None:
+        for batch in batches:
+            write(_ndjson_lines(batch, top_level_is_or, limit, trusted, _json_backend.name))
+            written += len(batch)
+        return written
+
+    with ProcessPoolExecutor(processes) as executor:
+        # a couple of batches in flight per process, so the input isn't read ahead unbounded
+        pending = deque()
+        for batch in batches:
+            pending.append((len(batch), executor.submit(_ndjson_lines, batch, top_level_is_or, limit,
+                                                        trusted, _json_backend.name)))
+            if len(pending) >= processes * 2:
+                count, future = pending.popleft()
+                write(future.result())
+                written += count
+        while pending:
+            count, future = pending.popleft()
+            write(future.result())
+            written += count
+    return written
 
 
 def filter_grouping(*column_expression):
@@ -46,49 +46,9 @@ class TestBuild(TestCase):
 
     left = "left"
     right = "right"
-
-
-class _SARObservationDirectionEnumQuery(_EnumQuery):
-    \"\"\"
-    SAR Observation Direction Enum Query Interface
-    \"\"\"
-
-    @classmethod
-    def init_enums(cls, field_name, parent_obj: QueryBuilder, enum_fields: list[str]):
-        o = _SARObservationDirectionEnumQuery(field_name, parent_obj)
-        o._enum_values = set(enum_fields)
-        return o
-
-    def equals(self, value: SARObservationDirectionEnum) -> QueryBuilder:
-        self._check([value.value])
-        self._eq_value = value.value
-        return self._parent_obj
-
-    def not_equals(self, value: SARObservationDirectionEnum) -> QueryBuilder:
-        self._check([value.value])
-        self._ne_value = value.value
-        return self._parent_obj
-
-    def in_set(self, values: list[SARObservationDirectionEnum]) -> QueryBuilder:
-        extracted = [x.value for x in values]
-        self._check(extracted)
-        self._in_values = extracted
-        return self._parent_obj
-
-    def not_in_set(self, values: list[SARObservationDirectionEnum]) -> QueryBuilder:
-        extracted = [x.value for x in values]
-        self._check(extracted)
-        self._not_in_values = extracted
-        return self._parent_obj
-
-    def left(self) -> QueryBuilder:
-        return self.equals(SARObservationDirectionEnum.left)
-
-    def right(self) -> QueryBuilder:
-        return self.equals(SARObservationDirectionEnum.right)
 """
         expected_lines = expected.split("\n")
-        actual, _ = build_enum(input_key, input_obj, full_enum_name=True, add_unique=True)
+        actual, _ = build_enum(input_key, input_obj, full_enum_name=True)
         actual_lines = actual.split("\n")
         for a in zip(expected_lines, actual_lines):
             if a[0] != a[1]:
@@ -124,40 +84,6 @@ class _SARObservationDirectionEnumQuery(_EnumQuery):
     Ku = "Ku"
     K = "K"
     Ka = "Ka"
-
-
-class _SARFrequencyBandEnumQuery(_EnumQuery):
-    \"\"\"
-    SAR Frequency Band Enum Query Interface
-    \"\"\"
-
-    @classmethod
-    def init_enums(cls, field_name, parent_obj: QueryBuilder, enum_fields: list[str]):
-        o = _SARFrequencyBandEnumQuery(field_name, parent_obj)
-        o._enum_values = set(enum_fields)
-        return o
-
-    def equals(self, value: SARFrequencyBandEnum) -> QueryBuilder:
-        self._check([value.value])
-        self._eq_value = value.value
-        return self._parent_obj
-
-    def not_equals(self, value: SARFrequencyBandEnum) -> QueryBuilder:
-        self._check([value.value])
-        self._ne_value = value.value
-        return self._parent_obj
-
-    def in_set(self, values: list[SARFrequencyBandEnum]) -> QueryBuilder:
-        extracted = [x.value for x in values]
-        self._check(extracted)
-        self._in_values = extracted
-        return self._parent_obj
-
-    def not_in_set(self, values: list[SARFrequencyBandEnum]) -> QueryBuilder:
-        extracted = [x.value for x in values]
-        self._check(extracted)
-        self._not_in_values = extracted
-        return self._parent_obj
 """
         expected_lines = expected.split("\n")
         actual, _ = build_enum(input_key, input_obj, full_enum_name=True)
@@ -180,53 +106,14 @@ class _SARFrequencyBandEnumQuery(_EnumQuery):
         expected = """class SARObservationDirectionEnum(str, Enum):
     \"\"\"
     SAR Observation Direction Enum
+    Antenna pointing direction
     \"\"\"
 
     left = "left"
     right = "right"
-
-
-class _SARObservationDirectionEnumQuery(_EnumQuery):
-    \"\"\"
-    SAR Observation Direction Enum Query Interface
-    \"\"\"
-
-    @classmethod
-    def init_enums(cls, field_name, parent_obj: QueryBuilder, enum_fields: list[str]):
-        o = _SARObservationDirectionEnumQuery(field_name, parent_obj)
-        o._enum_values = set(enum_fields)
-        return o
-
-    def equals(self, value: SARObservationDirectionEnum) -> QueryBuilder:
-        self._check([value.value])
-        self._eq_value = value.value
-        return self._parent_obj
-
-    def not_equals(self, value: SARObservationDirectionEnum) -> QueryBuilder:
-        self._check([value.value])
-        self._ne_value = value.value
-        return self._parent_obj
-
-    def in_set(self, values: list[SARObservationDirectionEnum]) -> QueryBuilder:
-        extracted = [x.value for x in values]
-        self._check(extracted)
-        self._in_values = extracted
-        return self._parent_obj
-
-    def not_in_set(self, values: list[SARObservationDirectionEnum]) -> QueryBuilder:
-        extracted = [x.value for x in values]
-        self._check(extracted)
-        self._not_in_values = extracted
-        return self._parent_obj
-
-    def left(self) -> QueryBuilder:
-        return self.equals(SARObservationDirectionEnum.left)
-
-    def right(self) -> QueryBuilder:
-        return self.equals(SARObservationDirectionEnum.right)
 """
         expected_lines = expected.split("\n")
-        actual, _ = build_enum(input_key, input_obj, full_enum_name=True, add_unique=True)
+        actual, _ = build_enum(input_key, input_obj, full_enum_name=True, field_description=input_obj["title"])
         actual_lines = actual.split("\n")
         for a in zip(expected_lines, actual_lines):
             if a[0] != a[1]:
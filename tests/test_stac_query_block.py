@@ -1,7 +1,17 @@
+import gc
+import gzip
+import io
 import json
+import operator
+import os
+import random
+import tempfile
+import time
 import unittest
 import uuid
+import weakref
 from datetime import date, datetime, timedelta, timezone
+from unittest import mock
 
 import pytest
 import shapely
@@ -17,12 +27,52 @@ from cqlalchemy.stac.query import (
     PLPublishingStageEnum,
     PLQualityCategoryEnum,
     QueryBuilder,
+    QueryBuilderPool,
     SARFrequencyBandEnum,
     SARObservationDirectionEnum,
     SATOrbitStateEnum,
+    _DateTimeEncoder,
+    _is_binary_stream,
     _NumberQuery,
+    filter_grouping,
+    query_dump_ndjson,
+    set_json_backend,
 )
 
+
+def _compact_json(obj):
+    return json.dumps(obj, separators=(",", ":"), cls=_DateTimeEncoder)
+
+
+_COMPARISONS = {"=": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le,
+                ">": operator.gt, ">=": operator.ge}
+
+
+def _cached_fragment(q, field_name: str) -> bytes:
+    # fragments are cached per (json backend, field name)
+    (fragment,) = [v[1] for k, v in q._fragment_cache.items() if k[1] == field_name]
+    return fragment
+
+
+def _evaluate(node, item: dict) -> bool:
+    # a minimal cql2-json evaluator over a dict of item properties
+    op, args = node["op"], node["args"]
+    if op == "and":
+        return all(_evaluate(x, item) for x in args)
+    if op == "or":
+        return any(_evaluate(x, item) for x in args)
+    if op == "not":
+        return not _evaluate(args[0], item)
+    value = item.get(args[0]["property"])
+    if op == "isNull":
+        return value is None
+    if value is None:
+        return False
+    if op == "in":
+        return value in args[1]
+    return _COMPARISONS[op](value, args[1])
+
+
 GEOMETRY_ERRORS = [
     ('MultiPolygon', [[[[0, 3], [0, 4], [0, 5]]]], shapely.errors.GEOSException),
     ('MultiPolygon', [[[[0, 3], [0, 4], [0, 5], [0, 3]]]], False),
@@ -858,6 +908,27 @@ class STACTestCase(unittest.TestCase):
         b = _NumberQuery.init_with_limits("field", QueryBuilder())
         self.assertIsNotNone(b.equals(value=3.3))
 
+    def test_subclass_fields(self):
+        class CustomQueryBuilder(QueryBuilder):
+            def __init__(self, trusted=False):
+                super().__init__(trusted=trusted)
+                self.custom = _NumberQuery.init_with_limits("custom:val", self, 0, 10)
+                self.rank = _NumberQuery.init_with_limits("rank", self, is_int=True)
+
+        a = CustomQueryBuilder()
+        a.custom.lt(5)
+        a.eo.cloud_cover.lt(20)
+        a.rank.equals(2)
+        a.collection.equals("landsat-c2-l2")
+        self.assertRaises(ValueError, a.custom.gt, 11)
+        properties = [x["args"][0]["property"] for x in a.query_dump()["filter"]["args"]]
+        self.assertEqual(["collection", "rank", "eo:cloud_cover", "custom:val"], properties)
+        self.assertEqual(a.query_dump_json(), _compact_json(a.query_dump()))
+        b = a.fork()
+        b.custom.equals(1)
+        self.assertIn({"op": "=", "args": [{"property": "custom:val"}, 1]}, b.query_dump()["filter"]["args"])
+        self.assertIn({"op": "<", "args": [{"property": "custom:val"}, 5]}, a.query_dump()["filter"]["args"])
+
     def test_filter_or(self):
         # TODO document this user error
         a = QueryBuilder()
@@ -904,10 +975,10 @@ class STACTestCase(unittest.TestCase):
 
         dumped_json = a.query_dump_json()
         self.assertIn("2024-01-05T00:01:02+00:00", dumped_json)
-        self.assertIn("\"coordinates\": [45.0", dumped_json)
+        self.assertIn("\"coordinates\":[45.0", dumped_json)
         self.assertIn("\"Umbra-09\"", dumped_json)
         self.assertIn("\"Hugging Face\"", dumped_json)
-        self.assertIn("\"type\": \"Point", dumped_json)
+        self.assertIn("\"type\":\"Point", dumped_json)
         self.assertIsNotNone(a.query_dump_json(indent=2))
         a.query_dump_json()
 
@@ -1067,6 +1138,49 @@ class STACTestCase(unittest.TestCase):
 
         self.assertEqual(summary, 'mlm:framework NOT IN ["Hugging Face", "JAX"]')
 
+    def test_query_summary_bounded(self):
+        a = QueryBuilder()
+        a.platform.in_set([f"landsat-{i}" for i in range(10_000)])
+        a.id.equals("x" * 1_000)
+        a.geometry.intersects(shapely.Polygon([(0, 0), (4, 0), (4, 3), (0, 0)], [[(1, 0.5), (2, 0.5), (2, 1), (1, 0.5)]]))
+
+        summary = a.query_summary(max_value_chars=40)
+
+        self.assertEqual(summary, 'id = "xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx...\n'
+                                  "AND s_intersects(geometry, Polygon(8 vertices, bbox [0, 0, 4, 3]))\n"
+                                  'AND platform IN ["landsat-0", ... 9,999 more]')
+        self.assertEqual(a.query_summary(max_value_chars=4), 'id = "...\n'
+                                                             "AND s_intersects(geometry, Polygon(8 vertices, bbox [0, 0, 4, 3]))\n"
+                                                             "AND platform IN [... 10,000 more]")
+        self.assertEqual(a.query_summary(multiline=False, max_value_chars=40, max_chars=60),
+                         'id = "xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx... AND ... 2 more')
+        self.assertEqual(a.query_summary(max_chars=10), "... 3 more")
+        self.assertGreater(len(a.query_summary()), 100_000)
+
+        b = QueryBuilder()
+        b.filter(b.gsd > 1)
+        for i in range(100):
+            b.filter(b.eo.cloud_cover < i)
+        self.assertEqual(b.query_summary(multiline=False, max_chars=50), "gsd > 1 AND eo:cloud_cover < 0 AND ... 99 more")
+        summary = b.query_summary(max_chars=500)
+        self.assertLessEqual(len(summary), 500)
+        self.assertTrue(summary.endswith("\nAND eo:cloud_cover < 19\nAND ... 80 more"))
+
+    def test_query_summary_empty_rings(self):
+        # trusted builders accept geometries without validating them
+        for geometry, expected in [
+            ({"type": "Polygon", "coordinates": [[]]}, "Polygon(0 vertices)"),
+            ({"type": "Polygon", "coordinates": []}, "Polygon(0 vertices)"),
+            ({"type": "MultiPolygon", "coordinates": [[[]], [[[0, 0], [2, 0], [2, 1], [0, 0]], []]]},
+             "MultiPolygon(4 vertices, bbox [0, 0, 2, 1])"),
+            ({"type": "GeometryCollection", "geometries": [{"type": "LineString", "coordinates": []},
+                                                           {"type": "Polygon", "coordinates": [[]]}]},
+             "GeometryCollection(0 vertices)"),
+        ]:
+            a = QueryBuilder(trusted=True)
+            a.geometry.intersects(geometry)
+            self.assertEqual(a.query_summary(max_value_chars=80), f"s_intersects(geometry, {expected})")
+
     def test_null_projection(self):
         a = QueryBuilder()
         a.proj.bbox.is_null()
@@ -1131,6 +1245,836 @@ class STACTestCase(unittest.TestCase):
         self.assertEqual(a_dict["filter"]["args"][0]["args"][1], str("landsat-c2-l2"))
         a.query_dump_json()
 
+    def test_lazy_extensions(self):
+        a = QueryBuilder()
+        self.assertNotIn("eo", vars(a))
+        self.assertNotIn("sar", vars(a))
+        a.datetime.lt(datetime(2024, 1, 5, tzinfo=timezone.utc)).eo.cloud_cover.lt(20)
+        self.assertIn("eo", vars(a))
+        self.assertNotIn("sar", vars(a))
+        self.assertIs(a.eo, a.eo)
+        self.assertIsNot(a.eo, QueryBuilder().eo)
+
+    def test_extension_order(self):
+        a = QueryBuilder()
+        a.view.off_nadir.lt(10)
+        a.eo.cloud_cover.lt(20)
+        b = QueryBuilder()
+        b.eo.cloud_cover.lt(20)
+        b.view.off_nadir.lt(10)
+        self.assertEqual(a.query_dump(), b.query_dump())
+        self.assertEqual(a.query_dump()["filter"]["args"][0]["args"][0]["property"], "eo:cloud_cover")
+
+    def test_builder_footprint(self):
+        # the size of an empty builder is budgeted per python version in test_benchmark.py
+        builders = [QueryBuilder(), QueryBuilder()]
+        self.assertFalse(hasattr(builders[0].datetime, "__dict__"))
+        self.assertIs(builders[0].datetime._state, builders[1].gsd._state)
+
+    def test_field_state_not_shared(self):
+        a = QueryBuilder()
+        b = QueryBuilder()
+        a.eo.cloud_cover.lt(20)
+        self.assertIsNone(b.query_dump())
+        self.assertEqual(a.eo.cloud_cover._state.lt_value, 20)
+
+    def test_field_registry(self):
+        a = QueryBuilder()
+        b = QueryBuilder()
+        self.assertIs(a.eo.cloud_cover._meta, b.eo.cloud_cover._meta)
+        meta = a.eo.cloud_cover._meta
+        self.assertEqual((meta.field_name, meta.field_type, meta.min_value, meta.max_value, meta.is_int),
+                         ("eo:cloud_cover", "number", 0, 100, False))
+        self.assertTrue(a.mlm.memory_size._meta.is_int)
+        self.assertEqual(a.sat.orbit_state._meta.enum_values, frozenset(x.value for x in SATOrbitStateEnum))
+        self.assertEqual(QueryBuilder._field_registry["gsd"].min_value, 0)
+        with self.assertRaises(TypeError):
+            QueryBuilder._field_registry["gsd"] = None
+
+    def test_query_dump_builds_set_fields_once(self):
+        a = QueryBuilder()
+        a.eo.cloud_cover.lt(20)
+        a.gsd.gt(1)
+        a.platform.equals("landsat-9")
+        a.platform._clear_values()
+        with mock.patch.object(_NumberQuery, "_build_query", autospec=True,
+                               side_effect=_NumberQuery._build_query) as build_query:
+            args = a.query_dump()["filter"]["args"]
+        self.assertEqual(build_query.call_count, 2)
+        self.assertEqual([x["args"][0]["property"] for x in args], ["gsd", "eo:cloud_cover"])
+        self.assertEqual(set(a._field_state), {"eo:cloud_cover", "gsd", "platform"})
+
+    def test_memoized_dumps(self):
+        a = QueryBuilder()
+        a.eo.cloud_cover.lt(20)
+        first = a.query_dump()
+        self.assertIs(a._query_dump_tree(), a._query_dump_tree())
+        # callers get a copy they can change without affecting later dumps
+        self.assertIsNot(a.query_dump(), first)
+        fingerprint = a.fingerprint()
+        first["limit"] = 5
+        first["filter"]["args"].append({"op": "isNull", "args": [{"property": "gsd"}]})
+        self.assertEqual(a.query_dump(), {"filter-lang": "cql2-json", "filter": {
+            "op": "and", "args": [{"op": "<", "args": [{"property": "eo:cloud_cover"}, 20]}]}})
+        self.assertNotIn("LIMIT", a.query_summary())
+        self.assertEqual(a.fingerprint(), fingerprint)
+        self.assertIsNot(a.query_dump(normalize=True), a.query_dump(normalize=True))
+        json_dump = a.query_dump_json()
+        self.assertIs(a.query_dump_json(), json_dump)
+        self.assertIsNot(a.query_dump_json(indent=2), json_dump)
+        summary = a.query_summary()
+
+        a.platform.equals("landsat-9")
+        self.assertEqual(len(a.query_dump()["filter"]["args"]), 2)
+        self.assertNotEqual(a.query_dump_json(), json_dump)
+        self.assertNotEqual(a.query_summary(), summary)
+
+        a.datetime.sort_by_desc()
+        self.assertIn("sortby", a.query_dump())
+        dump = a.query_dump()
+        a.filter(a.gsd > 10)
+        self.assertIsNot(a.query_dump(), dump)
+        a.reset()
+        self.assertIsNone(a.query_dump())
+
+    def test_spliced_query_dump_json(self):
+        a = QueryBuilder()
+        self.assertEqual(a.query_dump_json(), json.dumps(None))
+        a.geometry.intersects(Point(4, 5))
+        a.datetime.lt(datetime(2024, 2, 1, tzinfo=timezone.utc))
+        a.sat.orbit_state.in_set([SATOrbitStateEnum.ascending])
+        a.filter((a.gsd > 10) | (a.gsd < 2))
+        a.eo.cloud_cover.lt(20)
+        a.landsat.wrs_path.is_null()
+        a.updated.sort_by_desc()
+        for kwargs in [{}, {"limit": 10}, {"top_level_is_or": True}]:
+            self.assertEqual(a.query_dump_json(**kwargs), _compact_json(a.query_dump(**kwargs)))
+
+        geometry_fragment = _cached_fragment(a, "geometry")
+        a.eo.cloud_cover.lt(5)
+        self.assertIn('"args":[{"property":"eo:cloud_cover"},5]', a.query_dump_json())
+        self.assertIs(_cached_fragment(a, "geometry"), geometry_fragment)
+
+        b = a.fork()
+        b.eo.cloud_cover.lt(1)
+        self.assertEqual(b.query_dump_json(), _compact_json(b.query_dump()))
+        self.assertIs(_cached_fragment(b, "geometry"), geometry_fragment)
+        self.assertIn('"args":[{"property":"eo:cloud_cover"},5]', a.query_dump_json(indent=None, sort_keys=False, limit=3))
+
+    def test_discarded_forks_are_collected(self):
+        a = QueryBuilder()
+        a.eo.cloud_cover.lt(20)
+        a.filter(a.gsd > 10)
+        a.query_dump_json()
+        children = []
+        for i in range(20):
+            child = a.fork()
+            child.filter(child.gsd < i)
+            child.query_dump_json()
+            children.append(weakref.ref(child))
+        del child
+        gc.collect()
+        self.assertEqual([], [x for x in children if x() is not None])
+        # fragments of a's own filters are still reused
+        self.assertEqual(["eo:cloud_cover"], [x[1] for x in a._fragment_cache])
+        self.assertEqual(1, len(a._filter_fragment_cache))
+        b = a.fork()
+        b.filter(b.gsd < 5)
+        self.assertEqual(b.query_dump_json(), _compact_json(b.query_dump()))
+        self.assertEqual(1, len(a._filter_fragment_cache))
+
+    def test_query_dump_bytes(self):
+        a = QueryBuilder()
+        self.assertEqual(a.query_dump_bytes(), b"null")
+        a.geometry.intersects(Point(4, 5))
+        a.datetime.lt(datetime(2024, 2, 1, tzinfo=timezone.utc))
+        a.filter(a.gsd > 10)
+        a.eo.cloud_cover.lt(20)
+        a.updated.sort_by_desc()
+        for kwargs in [{}, {"limit": 10}, {"top_level_is_or": True}]:
+            self.assertEqual(a.query_dump_bytes(**kwargs), a.query_dump_json(**kwargs).encode())
+        body = a.query_dump_bytes()
+        self.assertIsInstance(body, bytes)
+        self.assertIs(a.query_dump_bytes(), body)
+
+        geometry_fragment = _cached_fragment(a, "geometry")
+        a.eo.cloud_cover.lt(5)
+        self.assertEqual(a.query_dump_bytes(), _compact_json(a.query_dump()).encode())
+        self.assertIs(_cached_fragment(a, "geometry"), geometry_fragment)
+
+    def test_fingerprint(self):
+        exterior = [(0, 0), (4, 0), (4, 4), (0, 4), (0, 0)]
+        holes = [[(1, 1), (1, 2), (2, 2), (1, 1)], [(3, 3), (3, 3.5), (3.5, 3.5), (3, 3)]]
+        a = QueryBuilder()
+        a.datetime.gte(datetime(2024, 1, 1, 2, tzinfo=timezone(timedelta(hours=2))))
+        a.platform.in_set(["landsat-9", "landsat-8", "landsat-9"])
+        a.filter(a.gsd > 1)
+        a.filter(a.gsd < 20.0)
+        a.geometry.intersects(shapely.Polygon(exterior, holes))
+        a.eo.cloud_cover.lt(20)
+        b = QueryBuilder()
+        b.eo.cloud_cover.lt(20.0)
+        b.filter(b.gsd < 20)
+        b.filter(b.gsd > 1.0)
+        b.platform.in_set(["landsat-8", "landsat-9"])
+        # same rings, rotated and wound the other way, with the holes reordered
+        rotated = [(4, 4), (4, 0), (0, 0), (0, 4), (4, 4)]
+        b.geometry.intersects(shapely.Polygon(rotated, [h[::-1] for h in holes[::-1]]))
+        b.datetime.gte(datetime(2024, 1, 1, tzinfo=timezone.utc))
+        self.assertNotEqual(a.query_dump(), b.query_dump())
+        self.assertEqual(a.query_dump_canonical(), b.query_dump_canonical())
+        self.assertEqual(a.fingerprint(), b.fingerprint())
+        self.assertEqual(len(a.fingerprint()), 64)
+
+        canonical = a.query_dump_canonical()["filter"]["args"]
+        self.assertIn({"op": ">=", "args": [{"property": "datetime"}, "2024-01-01T00:00:00Z"]}, canonical)
+        self.assertIn({"op": "in", "args": [{"property": "platform"}, ["landsat-8", "landsat-9"]]}, canonical)
+        geometry = next(x for x in canonical if x["op"] == "s_intersects")["args"][1]
+        self.assertEqual(geometry["coordinates"][0], [[0, 0], [4, 0], [4, 4], [0, 4], [0, 0]])
+        self.assertEqual(geometry["coordinates"][1], [[1, 1], [1, 2], [2, 2], [1, 1]])
+
+        self.assertNotEqual(a.fingerprint(limit=10), b.fingerprint())
+        self.assertNotEqual(a.fingerprint(top_level_is_or=True), b.fingerprint())
+        b.eo.cloud_cover.lt(21)
+        self.assertNotEqual(a.fingerprint(), b.fingerprint())
+        b.eo.cloud_cover.lt(20)
+        b.datetime.sort_by_desc()
+        self.assertNotEqual(a.fingerprint(), b.fingerprint())
+        self.assertIsNone(QueryBuilder().query_dump_canonical())
+
+    @unittest.skipUnless(hasattr(time, "tzset"), "needs time.tzset")
+    def test_fingerprint_naive_datetime(self):
+        q = QueryBuilder()
+        q.filter(q.datetime >= datetime(2024, 1, 1))
+        fingerprints = []
+        try:
+            for tz in ("UTC", "America/New_York"):
+                with mock.patch.dict(os.environ, {"TZ": tz}):
+                    time.tzset()
+                    canonical = q.query_dump_canonical()["filter"]
+                    self.assertEqual(canonical["args"][1], "2024-01-01T00:00:00")
+                    self.assertIn('"2024-01-01T00:00:00"', q.query_dump_json())
+                    fingerprints.append(q.fingerprint())
+        finally:
+            time.tzset()
+        self.assertEqual(fingerprints[0], fingerprints[1])
+
+    def test_shared_property_nodes(self):
+        a = QueryBuilder()
+        a.eo.cloud_cover.lt(20)
+        a.filter(a.eo.cloud_cover > 2)
+        b = QueryBuilder()
+        b.eo.cloud_cover.gt(5)
+        # the memoized bodies share one read-only node per field
+        a_node = a._query_dump_tree()["filter"]["args"][1]["args"][0]
+        self.assertEqual(a_node, {"property": "eo:cloud_cover"})
+        self.assertIs(a._query_dump_tree()["filter"]["args"][0]["args"][0]["args"][0], a_node)
+        self.assertIs(b._query_dump_tree()["filter"]["args"][0]["args"][0], a_node)
+        with self.assertRaises(TypeError):
+            a_node["property"] = "gsd"
+
+        # the public dump and property_obj are plain dicts the caller can modify
+        expected = a.query_dump_json()
+        body = a.query_dump()
+        self.assertIs(type(body["filter"]["args"][1]["args"][0]), dict)
+        body["filter"]["args"][1]["args"][0]["property"] = "gsd"
+        body["filter"]["args"][0]["args"][0]["args"][0]["property"] = "gsd"
+        self.assertEqual(a_node, {"property": "eo:cloud_cover"})
+        self.assertEqual(a.query_dump()["filter"]["args"][1]["args"][0], {"property": "eo:cloud_cover"})
+        self.assertEqual(b.query_dump()["filter"]["args"][0]["args"][0], {"property": "eo:cloud_cover"})
+        self.assertEqual(a.query_dump_json(), expected)
+        property_obj = a.eo.cloud_cover.property_obj
+        self.assertIs(type(property_obj), dict)
+        property_obj["property"] = "gsd"
+        self.assertEqual(a.eo.cloud_cover.property_obj, {"property": "eo:cloud_cover"})
+
+    def test_range_nodes(self):
+        def dump(*setters):
+            a = QueryBuilder()
+            for setter in setters:
+                setter(a.view.azimuth)
+            built = a.query_dump()
+            return None if built is None else built["filter"]["args"][0]
+
+        node = {"property": "view:azimuth"}
+        gt = {"op": ">", "args": [node, 300]}
+        lt = {"op": "<", "args": [node, 60]}
+        ne = {"op": "!=", "args": [node, 10]}
+        self.assertEqual(dump(lambda x: x.gt(300)), gt)
+        self.assertEqual(dump(lambda x: x.not_equals(10)), ne)
+        self.assertEqual(dump(lambda x: x.gt(300), lambda x: x.not_equals(10)), {"op": "and", "args": [gt, ne]})
+        self.assertEqual(dump(lambda x: x.lt(60), lambda x: x.not_equals(10)), {"op": "and", "args": [lt, ne]})
+        self.assertEqual(dump(lambda x: x.gt(30), lambda x: x.lt(60), lambda x: x.not_equals(10)),
+                         {"op": "and", "args": [{"op": ">", "args": [node, 30]}, lt, ne]})
+        self.assertEqual(dump(lambda x: x.gt(300), lambda x: x.lt(60)), {"op": "or", "args": [gt, lt]})
+        self.assertEqual(dump(lambda x: x.gt(300), lambda x: x.lt(60), lambda x: x.not_equals(10)),
+                         {"op": "and", "args": [{"op": "or", "args": [gt, lt]}, ne]})
+        self.assertIsNone(dump(lambda x: x.gt(60), lambda x: x.lt(60)))
+
+    def test_query_dump_binary(self):
+        self.assertIsNone(QueryBuilder.query_load_binary(QueryBuilder().query_dump_binary()))
+        a = QueryBuilder(trusted=True)
+        a.geometry.intersects(Point(45, 65).buffer(1))
+        a.datetime.gte(datetime(2024, 1, 1, tzinfo=timezone.utc))
+        a.updated.lt(datetime(2024, 3, 1, 5, 30, 0, 123, tzinfo=timezone(timedelta(hours=-7))))
+        a.filter((a.gsd > 10) | (a.view.incidence_angle < -2.5))
+        a.filter(a.eo.cloud_cover < 2 ** 40)
+        a.platform.not_in_set(["landsat-8", "sentinel-2é"])
+        a.landsat.scene_id.in_set(["LC08", "LC09\x00"])
+        a.landsat.wrs_path.is_null()
+        a.sar.looks_equivalent_number.equals(0.0)
+        a.datetime.sort_by_desc()
+
+        encoded = a.query_dump_binary(limit=5)
+        decoded = QueryBuilder.query_load_binary(encoded)
+        self.assertEqual(_compact_json(decoded), _compact_json(a.query_dump(limit=5)))
+        self.assertEqual(decoded["filter"]["args"][2]["args"][1], a.updated._state.lt_value)
+        self.assertEqual(decoded["filter"]["args"][2]["args"][1].utcoffset(), timedelta(hours=-7))
+        self.assertIs(type(decoded["filter"]["args"][0]["args"][0]), dict)
+        QueryBuilder.query_load_binary(encoded)["filter"]["args"][0]["args"][0]["property"] = "updated"
+        self.assertEqual(QueryBuilder.query_load_binary(encoded)["filter"]["args"][0]["args"][0],
+                         {"property": "datetime"})
+        self.assertLess(len(encoded), len(a.query_dump_bytes(limit=5)) / 2)
+        self.assertIs(a.query_dump_binary(limit=5), encoded)
+        self.assertEqual(QueryBuilder.query_load_binary(bytearray(encoded)), decoded)
+
+        with self.assertRaisesRegex(ValueError, "not a binary encoded query"):
+            QueryBuilder.query_load_binary(a.query_dump_bytes())
+        with self.assertRaisesRegex(ValueError, "version 2 is not supported"):
+            QueryBuilder.query_load_binary(encoded[:3] + b"\x02" + encoded[4:])
+        with self.assertRaisesRegex(ValueError, "different fields"):
+            QueryBuilder.query_load_binary(encoded[:4] + bytes(4) + encoded[8:])
+        b = QueryBuilder(trusted=True)
+        b.id.equals(uuid.uuid4())
+        with self.assertRaisesRegex(ValueError, "can't encode UUID"):
+            b.query_dump_binary()
+
+        # filters accept naive datetimes, which decode as naive
+        c = QueryBuilder()
+        c.filter(c.datetime > datetime(2024, 1, 1, 12, 30, 0, 5))
+        c.filter(c.created < datetime(1960, 6, 1))
+        decoded = QueryBuilder.query_load_binary(c.query_dump_binary())
+        self.assertEqual(decoded, c.query_dump())
+        self.assertIsNone(decoded["filter"]["args"][0]["args"][0]["args"][1].tzinfo)
+        self.assertEqual(_compact_json(decoded), c.query_dump_json())
+
+    def test_query_dump_ndjson(self):
+        a = QueryBuilder()
+        a.geometry.intersects(Point(4, 5))
+        a.datetime.lt(datetime(2024, 2, 1, tzinfo=timezone.utc))
+        a.updated.sort_by_desc()
+        specs = [{"eo:cloud_cover": {"lt": i}, "platform": {"in_set": ["landsat-8", "landsat-9"]}} for i in range(25)]
+        queries = [a, QueryBuilder()] + specs
+        expected = [a.query_dump_json(limit=3), "null"]
+        expected += [QueryBuilder().apply(spec).query_dump_json(limit=3) for spec in specs]
+
+        out = io.StringIO()
+        self.assertEqual(query_dump_ndjson(iter(queries), out, limit=3, batch_size=4), 27)
+        self.assertEqual(out.getvalue(), "\n".join(expected) + "\n")
+        out = io.BytesIO()
+        self.assertEqual(query_dump_ndjson(queries, out, limit=3, processes=2, batch_size=4), 27)
+        self.assertEqual(out.getvalue().decode(), "\n".join(expected) + "\n")
+
+        self.assertEqual(query_dump_ndjson([], out), 0)
+        with self.assertRaises(ValueError):
+            query_dump_ndjson([{"eo:cloud_cover": {"lt": -1}}], io.StringIO())
+        out = io.StringIO()
+        query_dump_ndjson([{"eo:cloud_cover": {"lt": -1}}], out, trusted=True)
+        self.assertIn('"args":[{"property":"eo:cloud_cover"},-1]', out.getvalue())
+
+        with tempfile.SpooledTemporaryFile(mode="w+b") as out:
+            self.assertEqual(query_dump_ndjson(specs[:2], out), 2)
+            out.seek(0)
+            self.assertEqual(out.read().decode(), "".join(QueryBuilder().apply(x).query_dump_json() + "\n"
+                                                          for x in specs[:2]))
+
+    def test_is_binary_stream(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = f"{directory}/query.json"
+            for mode, binary in [("w", False), ("wb", True), ("a", False), ("ab", True)]:
+                with open(path, mode) as fp:
+                    self.assertEqual(_is_binary_stream(fp), binary, mode)
+            with open(path, "wb", buffering=0) as fp:
+                self.assertTrue(_is_binary_stream(fp))
+        for mode, binary in [("w+b", True), ("w+", False)]:
+            with tempfile.SpooledTemporaryFile(mode=mode) as fp:
+                self.assertEqual(_is_binary_stream(fp), binary, mode)
+        self.assertFalse(_is_binary_stream(io.StringIO()))
+        self.assertTrue(_is_binary_stream(io.BytesIO()))
+        self.assertTrue(_is_binary_stream(gzip.GzipFile(fileobj=io.BytesIO(), mode="wb")))
+        self.assertFalse(_is_binary_stream(mock.Mock(spec=io.TextIOBase)))
+        # file-likes that are neither io classes nor have a mode take bytes
+        self.assertTrue(_is_binary_stream(mock.Mock(spec=["write"])))
+
+    def test_query_dump_gzip(self):
+        a = QueryBuilder()
+        a.geometry.intersects(Point(45, 65).buffer(1, 500))
+        a.datetime.lt(datetime(2024, 2, 1, tzinfo=timezone.utc))
+        a.platform.in_set(["landsat-8", "landsat-9"])
+        compressed = a.query_dump_gzip(limit=10)
+        self.assertEqual(compressed.headers, {"Content-Type": "application/json", "Content-Encoding": "gzip"})
+        self.assertEqual(gzip.decompress(compressed.body), a.query_dump_bytes(limit=10))
+        self.assertLess(len(compressed.body), len(a.query_dump_bytes(limit=10)) / 2)
+        self.assertIs(a.query_dump_gzip(limit=10).body, compressed.body)
+
+        b = a.fork()
+        b.eo.cloud_cover.lt(20)
+        b.reset().apply({"geometry": {"intersects": Point(45, 65).buffer(1, 500)},
+                         "datetime": {"lt": datetime(2024, 2, 1, tzinfo=timezone.utc)},
+                         "platform": {"in_set": ["landsat-8", "landsat-9"]}})
+        self.assertEqual(b.query_dump_gzip(limit=10).body, compressed.body)
+        self.assertEqual(gzip.decompress(a.query_dump_gzip(compresslevel=1).body), a.query_dump_bytes())
+        self.assertEqual(gzip.decompress(QueryBuilder().query_dump_gzip().body), b"null")
+
+    def test_normalized_query_dump(self):
+        a = QueryBuilder()
+        a.view.azimuth.gt(300).view.azimuth.lt(60).view.azimuth.not_equals(10)
+        a.eo.cloud_cover.gte(5).eo.cloud_cover.lt(60)
+        a.gsd.not_equals(15)
+        a.platform.not_in_set(["landsat-7"])
+        a.landsat.wrs_path.is_null()
+        a.filter((a.gsd > 10) | (a.gsd < 2) | (a.view.off_nadir < 5))
+        a.filter(a.eo.cloud_cover < 40)
+        a.filter(filter_grouping((a.gsd > 1) & (a.gsd < 30)) | filter_grouping((a.view.off_nadir > 10) | (a.gsd == 50)))
+        for top_level_is_or in [False, True]:
+            query = a.query_dump(top_level_is_or=top_level_is_or)
+            normalized = a.query_dump(top_level_is_or=top_level_is_or, normalize=True)
+
+            def check_flat(node):
+                if node["op"] in ("and", "or"):
+                    self.assertGreater(len(node["args"]), 1)
+                    for arg in node["args"]:
+                        self.assertNotEqual(arg["op"], node["op"])
+                if node["op"] in ("and", "or", "not"):
+                    for arg in node["args"]:
+                        check_flat(arg)
+            check_flat(normalized["filter"])
+            self.assertEqual(_compact_json(normalized), a.query_dump_json(top_level_is_or=top_level_is_or, normalize=True))
+            self.assertEqual(json.loads(a.query_dump_json(indent=2, normalize=True, top_level_is_or=top_level_is_or)),
+                             json.loads(_compact_json(normalized)))
+
+            rng = random.Random(11)
+            matches = 0
+            for _ in range(2_000):
+                item = {"view:azimuth": rng.choice([None, 0, 10, 30, 60, 100, 300, 310, 359]),
+                        "eo:cloud_cover": rng.choice([None, 0, 5, 20, 39, 40, 60, 80]),
+                        "gsd": rng.choice([None, 0.5, 1, 2, 10, 15, 20, 30, 50]),
+                        "view:off_nadir": rng.choice([None, 0, 5, 10, 20]),
+                        "platform": rng.choice([None, "landsat-7", "landsat-8"]),
+                        "landsat:wrs_path": rng.choice([None, "046"])}
+                expected = _evaluate(query["filter"], item)
+                self.assertEqual(_evaluate(normalized["filter"], item), expected, item)
+                matches += expected
+            # both outcomes are exercised
+            self.assertTrue(0 < matches < 2_000)
+
+        # the range and single filter 'and' wrappers are merged into the top level 'and'
+        self.assertEqual(len(a.query_dump()["filter"]["args"]), 8)
+        self.assertEqual(len(a.query_dump(normalize=True)["filter"]["args"]), 10)
+        self.assertEqual(a.query_dump(normalize=True)["filter"]["args"][3],
+                         {"op": "<", "args": [{"property": "eo:cloud_cover"}, 40]})
+        b = QueryBuilder()
+        b.eo.cloud_cover.lt(20)
+        self.assertEqual(b.query_dump(normalize=True)["filter"], {"op": "<", "args": [{"property": "eo:cloud_cover"}, 20]})
+        c = QueryBuilder()
+        c.filter(c.eo.cloud_cover < 20)
+        self.assertEqual(b.fingerprint(), c.fingerprint())
+        self.assertIsNone(QueryBuilder().query_dump(normalize=True))
+
+    def test_is_unsatisfiable(self):
+        jan = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        feb = datetime(2024, 2, 1, tzinfo=timezone.utc)
+        mar = datetime(2024, 3, 1, tzinfo=timezone.utc)
+        cases = [
+            (True, lambda q: q.eo.cloud_cover.gt(80).filter(q.eo.cloud_cover < 10)),
+            (True, lambda q: q.platform.not_in_set(["landsat-8"]).filter(q.platform == "landsat-8")),
+            (True, lambda q: q.datetime.gte(jan).datetime.lte(feb).filter(q.datetime > mar)),
+            (True, lambda q: q.eo.cloud_cover.gte(20).filter(q.eo.cloud_cover < 20)),
+            (True, lambda q: q.eo.cloud_cover.equals(20).filter(q.eo.cloud_cover != 20)),
+            (True, lambda q: q.platform.in_set(["landsat-8", "landsat-9"]).filter(q.platform == "sentinel-2a")),
+            (True, lambda q: q.gsd.is_null().filter(q.gsd > 1)),
+            (True, lambda q: q.view.azimuth.gt(300).view.azimuth.lt(60).filter(q.view.azimuth == 100)),
+            (True, lambda q: q.gsd.gt(5).filter((q.gsd < 2) | (q.gsd == 3))),
+            (True, lambda q: q.eo.cloud_cover.lt(10).gsd.gt(5)
+                .filter((q.gsd == 3) | filter_grouping((q.eo.cloud_cover > 50) & (q.gsd > 9)))),
+            (False, lambda q: q.eo.cloud_cover.lt(10).gsd.gt(5)
+                .filter((q.gsd == 3) | filter_grouping((q.eo.cloud_cover > 5) & (q.gsd > 9)))),
+            (False, lambda q: q.eo.cloud_cover.gt(80).filter(q.eo.cloud_cover < 90)),
+            (False, lambda q: q.eo.cloud_cover.gte(20).filter(q.eo.cloud_cover <= 20)),
+            (False, lambda q: q.platform.not_in_set(["landsat-7"]).filter(q.platform == "landsat-8")),
+            (False, lambda q: q.view.azimuth.gt(300).view.azimuth.lt(60).filter(q.view.azimuth == 30)),
+            (False, lambda q: q.gsd.gt(5).filter((q.gsd < 2) | (q.gsd == 30))),
+            (False, lambda q: q.datetime.gte(jan).filter(q.datetime < mar)),
+            (False, lambda q: q.id.equals("a").filter(q.gsd > 1)),
+        ]
+        for expected, build in cases:
+            q = QueryBuilder()
+            build(q)
+            self.assertEqual(q.is_unsatisfiable(), expected, q.query_summary(multiline=False))
+        self.assertFalse(QueryBuilder().is_unsatisfiable())
+
+        # with a top level 'or', every predicate has to be unsatisfiable on its own
+        q = QueryBuilder()
+        q.filter((q.gsd > 5) & (q.gsd < 2))
+        q.filter((q.eo.cloud_cover == 5) & (q.eo.cloud_cover != 5))
+        self.assertTrue(q.is_unsatisfiable(top_level_is_or=True))
+        q.view.off_nadir.lt(10)
+        self.assertTrue(q.is_unsatisfiable())
+        self.assertFalse(q.is_unsatisfiable(top_level_is_or=True))
+
+    def test_is_unsatisfiable_is_sound(self):
+        # a query flagged as unsatisfiable must not match any item
+        rng = random.Random(5)
+        values = [0, 5, 10, 20, 50]
+        setters = [
+            lambda q: q.eo.cloud_cover.gt(rng.choice(values)),
+            lambda q: q.eo.cloud_cover.lte(rng.choice(values)),
+            lambda q: q.eo.cloud_cover.not_equals(rng.choice(values)),
+            lambda q: q.gsd.equals(rng.choice(values)),
+            lambda q: q.gsd.is_null(),
+            lambda q: q.platform.in_set(rng.sample(["a", "b", "c"], 2)),
+            lambda q: q.platform.not_in_set(rng.sample(["a", "b", "c"], 1)),
+            lambda q: q.filter(q.eo.cloud_cover < rng.choice(values)),
+            lambda q: q.filter(q.gsd >= rng.choice(values)),
+            lambda q: q.filter((q.gsd > rng.choice(values)) | (q.eo.cloud_cover == rng.choice(values))),
+            lambda q: q.filter(q.platform == rng.choice(["a", "b", "c"])),
+        ]
+        items = [{"eo:cloud_cover": c, "gsd": g, "platform": p}
+                 for c in [None, 0, 3, 5, 7, 10, 15, 20, 35, 50, 60]
+                 for g in [None, 0, 3, 5, 7, 10, 15, 20, 35, 50, 60]
+                 for p in [None, "a", "b", "c"]]
+        flagged = 0
+        for _ in range(300):
+            q = QueryBuilder()
+            for setter in rng.sample(setters, 3):
+                setter(q)
+            if q.is_unsatisfiable():
+                flagged += 1
+                query_filter = q.query_dump()["filter"]
+                self.assertFalse(any(_evaluate(query_filter, item) for item in items), q.query_summary(multiline=False))
+        self.assertGreater(flagged, 10)
+
+    def test_drop_tautologies(self):
+        a = QueryBuilder()
+        a.view.off_nadir.gte(0)
+        a.eo.cloud_cover.lte(100)
+        a.sat.orbit_state.in_set([SATOrbitStateEnum.ascending, SATOrbitStateEnum.descending,
+                                  SATOrbitStateEnum.geostationary])
+        a.platform.equals("landsat-8")
+        expected = {"op": "=", "args": [{"property": "platform"}, "landsat-8"]}
+        self.assertEqual(expected, a.query_dump(drop_tautologies=True)["filter"])
+        self.assertEqual(4, len(a.query_dump()["filter"]["args"]))
+        self.assertLess(len(a.query_dump_json(drop_tautologies=True)), len(a.query_dump_json()))
+        self.assertEqual(_compact_json(a.query_dump(drop_tautologies=True)), a.query_dump_json(drop_tautologies=True))
+        self.assertEqual(a.query_dump(drop_tautologies=True), json.loads(a.query_dump_json(drop_tautologies=True, indent=2)))
+
+        # the side of a range inside the schema limits is kept
+        b = QueryBuilder()
+        b.eo.cloud_cover.gte(0)
+        b.eo.cloud_cover.lte(30)
+        b.view.azimuth.not_equals(90)
+        b.filter(b.gsd > 0)
+        b.filter((b.view.off_nadir < 5) | (b.view.off_nadir <= 90))
+        b.filter(b.view.azimuth != 400)
+        self.assertEqual({"op": "and", "args": [
+            {"op": ">", "args": [{"property": "gsd"}, 0]},
+            {"op": "<=", "args": [{"property": "eo:cloud_cover"}, 30]},
+            {"op": "!=", "args": [{"property": "view:azimuth"}, 90]},
+        ]}, b.query_dump(drop_tautologies=True)["filter"])
+
+        c = QueryBuilder(trusted=True)
+        c.sat.orbit_state.not_equals("polar")
+        c.sar.frequency_band.not_in_set(["not-a-band"])
+        c.eo.cloud_cover.gt(-1)
+        self.assertIsNone(c.query_dump(drop_tautologies=True))
+        self.assertEqual("null", c.query_dump_json(drop_tautologies=True))
+        self.assertIsNone(QueryBuilder().query_dump(drop_tautologies=True))
+
+        # memoized until the builder changes
+        self.assertIs(a._query_dump_tree(drop_tautologies=True), a._query_dump_tree(drop_tautologies=True))
+        a.eo.cloud_cover.lte(50)
+        self.assertEqual(2, len(a.query_dump(drop_tautologies=True)["filter"]["args"]))
+
+    def test_drop_tautologies_is_equivalent(self):
+        # for items that have the properties, dropping tautologies never changes a match
+        rng = random.Random(11)
+        values = [-5, 0, 20, 90, 100, 120]
+        setters = [
+            lambda q: q.eo.cloud_cover.gte(rng.choice(values)),
+            lambda q: q.eo.cloud_cover.lt(rng.choice(values)),
+            lambda q: q.view.off_nadir.gt(rng.choice(values)),
+            lambda q: q.view.off_nadir.lte(rng.choice(values)),
+            lambda q: q.view.off_nadir.not_equals(rng.choice(values)),
+            lambda q: q.sat.orbit_state.in_set(rng.sample(["ascending", "descending", "geostationary"], rng.randint(1, 3))),
+            lambda q: q.filter(q.eo.cloud_cover <= rng.choice(values)),
+            lambda q: q.filter((q.view.off_nadir >= rng.choice(values)) | (q.eo.cloud_cover > rng.choice(values))),
+        ]
+        items = [{"eo:cloud_cover": c, "view:off_nadir": v, "sat:orbit_state": s}
+                 for c in [0, 10, 20, 50, 100]
+                 for v in [0, 10, 20, 45, 90]
+                 for s in ["ascending", "descending", "geostationary"]]
+        dropped = 0
+        for _ in range(300):
+            q = QueryBuilder(trusted=True)
+            for setter in rng.sample(setters, 3):
+                setter(q)
+            query = q.query_dump(drop_tautologies=True)
+            if query == q.query_dump(normalize=True):
+                continue
+            dropped += 1
+            for item in items:
+                matches = query is None or _evaluate(query["filter"], item)
+                self.assertEqual(_evaluate(q.query_dump()["filter"], item), matches, q.query_summary(multiline=False))
+        self.assertGreater(dropped, 50)
+
+    def test_json_backends(self):
+        a = QueryBuilder()
+        a.datetime.delta(date(2024, 1, 5), timedelta(days=2))
+        a.updated.gt(datetime(2024, 1, 5, 0, 1, 2, 345, tzinfo=timezone.utc))
+        a.filter(a.created > datetime(2023, 6, 1, tzinfo=timezone.utc))
+        a.geometry.intersects(Point(45, 65).buffer(1))
+        a.mlm.framework.equals(MLMFrameworkEnum.Hugging_Face)
+        a.eo.cloud_cover.lt(20.5)
+        a.filter(a.platform == "café")
+        expected = _compact_json(a.query_dump(limit=5))
+        # memoized output and cached fragments are per backend, so switching back and forth
+        # never returns another backend's encoding
+        for name in ["stdlib", "orjson", "stdlib"]:
+            with self.subTest(backend=name):
+                if name == "orjson":
+                    pytest.importorskip("orjson")
+                previous = set_json_backend(name)
+                try:
+                    self.assertEqual(QueryBuilder().query_dump_json(), "null")
+                    body = a.query_dump_json(limit=5)
+                    self.assertEqual(json.loads(body), json.loads(expected))
+                    # stdlib escapes non-ASCII characters, orjson writes them as UTF-8
+                    self.assertEqual(body == expected, name == "stdlib")
+                    self.assertIn('"café"' if name == "orjson" else '"caf\\u00e9"', body)
+                    self.assertEqual(a.query_dump_bytes(limit=5), body.encode())
+                    self.assertEqual(gzip.decompress(a.query_dump_gzip(limit=5).body), body.encode())
+                finally:
+                    set_json_backend(previous)
+        with self.assertRaises(ValueError):
+            set_json_backend("simplejson")
+
+    def test_query_dump_to(self):
+        a = QueryBuilder()
+        out = io.StringIO()
+        a.query_dump_to(out)
+        self.assertEqual(out.getvalue(), "null")
+        a.geometry.intersects(Point(45, 65).buffer(1))
+        a.datetime.lt(datetime(2024, 2, 1, tzinfo=timezone.utc))
+        a.platform.in_set([f"platform-{i}" for i in range(50)])
+        a.filter((a.gsd > 10) | (a.gsd < 2))
+        a.eo.cloud_cover.lt(20)
+        a.updated.sort_by_desc()
+        for kwargs in [{}, {"limit": 10}, {"top_level_is_or": True}]:
+            for chunk_size in [1, 7, 4096]:
+                out = io.StringIO()
+                a.query_dump_to(out, chunk_size=chunk_size, **kwargs)
+                self.assertEqual(out.getvalue(), a.query_dump_json(**kwargs))
+
+        # cached fragments are written as they are, uncached predicates are streamed
+        a.eo.cloud_cover.lt(5)
+        out = io.BytesIO()
+        a.query_dump_to(out, chunk_size=3)
+        self.assertEqual(out.getvalue().decode(), a.query_dump_json())
+
+        writes = []
+        b = QueryBuilder()
+        b.platform.in_set([f"platform-{i}" for i in range(100)])
+        b.query_dump_to(mock.Mock(spec=io.TextIOBase, write=writes.append), chunk_size=10)
+        self.assertEqual("".join(writes), b.query_dump_json())
+        self.assertTrue(all(len(w) < 200 for w in writes))
+
+        for mode in ["w+b", "w+"]:
+            with tempfile.SpooledTemporaryFile(mode=mode) as out:
+                a.query_dump_to(out, chunk_size=3)
+                out.seek(0)
+                written = out.read()
+            self.assertEqual(written if mode == "w+" else written.decode(), a.query_dump_json())
+
+    def test_fork(self):
+        a = QueryBuilder()
+        a.collection.equals("landsat-c2-l2")
+        a.eo.cloud_cover.lt(20)
+        a.filter(a.gsd > 10)
+        a.datetime.sort_by_desc()
+        b = a.fork()
+        self.assertNotIn("eo", vars(b))
+        self.assertEqual(a.query_dump(), b.query_dump())
+
+        b.eo.cloud_cover.lt(5)
+        b.view.off_nadir.lt(10)
+        b.filter(b.gsd < 30)
+        self.assertEqual(a.eo.cloud_cover._state.lt_value, 20)
+        self.assertEqual(len(a.query_dump()["filter"]["args"]), 3)
+        self.assertNotIn("view", vars(a))
+        b_dict = b.query_dump()
+        self.assertEqual(len(b_dict["filter"]["args"]), 5)
+        self.assertEqual(b_dict["sortby"], [{"field": "datetime", "direction": "desc"}])
+
+        a.collection.equals("sentinel-2-l2a")
+        self.assertEqual(b.collection._state.eq_value, "landsat-c2-l2")
+
+    def test_fork_shares_until_write(self):
+        a = QueryBuilder()
+        a.eo.cloud_cover.lt(20)
+        b = a.fork()
+        c = b.fork()
+        self.assertIs(a._field_state, c._field_state)
+        c.platform.equals("landsat-9")
+        self.assertIsNot(a._field_state, c._field_state)
+        self.assertIs(a._field_state, b._field_state)
+        self.assertIsNone(b.platform._build_query())
+        self.assertEqual(c.query_dump()["filter"]["args"][1]["args"][1], 20)
+
+    def test_field(self):
+        a = QueryBuilder()
+        self.assertIs(a.field("eo:cloud_cover"), a.eo.cloud_cover)
+        self.assertIs(a.field("gsd"), a.gsd)
+        a.field("umbra:task_id").equals("abc")
+        self.assertEqual(a.umbra.task_id._state.eq_value, "abc")
+        for field_name in QueryBuilder._field_accessors:
+            self.assertEqual(a.field(field_name)._field_name, field_name)
+        with self.assertRaises(ValueError):
+            a.field("eo:not_a_field")
+
+    def test_apply(self):
+        a = QueryBuilder()
+        b = QueryBuilder()
+        self.assertIs(a.apply({
+            "collection": {"equals": "landsat-c2-l2"},
+            "eo:cloud_cover": {"gte": 5, "lt": 20},
+            "platform": {"in_set": ["landsat-8", "landsat-9"]},
+            "sat:orbit_state": {"equals": "ascending"},
+            "eo:snow_cover": {"is_null": True},
+        }), a)
+        b.collection.equals("landsat-c2-l2")
+        b.eo.cloud_cover.gte(5)
+        b.eo.cloud_cover.lt(20)
+        b.platform.in_set(["landsat-8", "landsat-9"])
+        b.sat.orbit_state.equals(SATOrbitStateEnum.ascending)
+        b.eo.snow_cover.is_null()
+        self.assertEqual(a.query_dump(), b.query_dump())
+
+    def test_apply_errors(self):
+        a = QueryBuilder()
+        a.eo.cloud_cover.lt(20)
+        with self.assertRaises(ValueError) as context:
+            a.apply({
+                "platform": {"equals": "landsat-9"},
+                "eo:cloud_cover": {"lt": 101},
+                "sat:orbit_state": {"in_set": ["ascending", "sideways"]},
+                "eo:not_a_field": {"equals": 1},
+                "gsd": {"between": [1, 2]},
+            })
+        message = str(context.exception)
+        for expected in ["eo:cloud_cover", "sideways", "eo:not_a_field", "between"]:
+            self.assertIn(expected, message)
+        self.assertEqual(len(a.query_dump()["filter"]["args"]), 1)
+        self.assertEqual(a.eo.cloud_cover._state.lt_value, 20)
+
+        # invalid geometries and operations that aren't a mapping are reported with the rest
+        with self.assertRaises(ValueError) as context:
+            a.apply({
+                "geometry": {"intersects": {"type": "Polygon", "coordinates": [[[0, 0], [1, 1]]]}},
+                "gsd": 5,
+                "eo:cloud_cover": {"lt": 101},
+            })
+        message = str(context.exception)
+        for expected in ["geometry: intersects", "gsd: expected a mapping of operations, got int", "eo:cloud_cover"]:
+            self.assertIn(expected, message)
+        self.assertIsNone(a.geometry._state.geometry)
+        self.assertEqual(a.eo.cloud_cover._state.lt_value, 20)
+
+    def test_apply_writes_once(self):
+        a = QueryBuilder()
+        a.eo.cloud_cover.lt(20)
+        b = a.fork()
+        field_state, version = b._field_state, b._version
+        with self.assertRaises(ValueError):
+            b.apply({"gsd": {"gt": 1}, "eo:cloud_cover": {"lt": 101}})
+        # a rejected spec doesn't write, so nothing is copied or invalidated
+        self.assertIs(b._field_state, field_state)
+        self.assertEqual(b._version, version)
+
+        b.apply({"gsd": {"gt": 1, "lt": 5}, "eo:cloud_cover": {"lt": 10}, "platform": {"is_null": False}})
+        self.assertEqual(b._version, version + 1)
+        self.assertFalse(b._field_state_shared)
+        self.assertEqual(set(b._field_state), {"eo:cloud_cover", "gsd"})
+        self.assertEqual(a.eo.cloud_cover._state.lt_value, 20)
+        # the builder owns its state again, so the next setter doesn't copy it
+        field_state = b._field_state
+        b.platform.equals("landsat-9")
+        self.assertIs(b._field_state, field_state)
+
+    def test_enum_member_shortcuts(self):
+        a = QueryBuilder()
+        self.assertIs(a.sat.orbit_state.descending(), a)
+        self.assertEqual(a.sat.orbit_state._state.eq_value, "descending")
+        self.assertIs(a.sat.orbit_state._meta.enum_type, SATOrbitStateEnum)
+        self.assertIn("geostationary", dir(a.sat.orbit_state))
+        with self.assertRaises(AttributeError):
+            a.sat.orbit_state.sideways()
+        a.sat.orbit_state.in_set([SATOrbitStateEnum.ascending, "descending"])
+        self.assertEqual(a.sat.orbit_state._state.in_values, ["ascending", "descending"])
+
+    def test_unchecked(self):
+        a = QueryBuilder()
+        with a.unchecked() as b:
+            self.assertIs(a, b)
+            a.eo.cloud_cover.lt(101)
+            a.mlm.memory_size.equals(1.5)
+            a.sat.orbit_state.in_set(["sideways"])
+            a.geometry.intersects({"type": "Polygon", "coordinates": [[[0, 3], [0, 4], [0, 5]]]})
+        self.assertEqual(a.eo.cloud_cover._state.lt_value, 101)
+        self.assertEqual(a.sat.orbit_state._state.in_values, ["sideways"])
+        with self.assertRaises(ValueError):
+            a.eo.cloud_cover.lt(101)
+
+        c = QueryBuilder(trusted=True)
+        c.view.off_nadir.gt(-1)
+        self.assertTrue(c.fork()._trusted)
+        self.assertFalse(QueryBuilder()._trusted)
+
+    def test_reset(self):
+        a = QueryBuilder()
+        a.eo.cloud_cover.lt(20)
+        a.filter(a.gsd > 10)
+        a.datetime.sort_by_asc()
+        b = a.fork()
+        self.assertIs(b.reset(), b)
+        self.assertIsNone(b.query_dump())
+        self.assertIsNone(b._sort_by_field)
+        self.assertEqual(len(a.query_dump()["filter"]["args"]), 2)
+        eo = a.eo
+        a.reset()
+        self.assertIsNone(a.query_dump())
+        self.assertIs(a.eo, eo)
+        a.platform.equals("landsat-9")
+        self.assertEqual(len(a.query_dump()["filter"]["args"]), 1)
+
+    def test_pool(self):
+        pool = QueryBuilderPool(max_size=1)
+        with pool.borrow() as a:
+            a.eo.cloud_cover.lt(20)
+        b = pool.acquire()
+        self.assertIs(a, b)
+        self.assertIsNone(b.query_dump())
+        c = pool.acquire()
+        self.assertIsNot(b, c)
+        pool.release(b)
+        pool.release(c)
+        self.assertEqual(len(pool._builders), 1)
+
+        pool.acquire()
+        pool.release(QueryBuilder(trusted=True))
+        self.assertEqual(len(pool._builders), 0)
+        with pool.borrow() as d:
+            self.assertRaises(ValueError, d.eo.cloud_cover.lt, 500)
+
 
 class TestExtensionEnums(unittest.TestCase):
     def test_planet_enum(self):